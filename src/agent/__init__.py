@@ -1,13 +1,20 @@
+from .answer_cache import AnswerCache
 from .engine import AgentEngine
+from .llm_pool import LLMEndpoint, LLMPool
 from .models import AgentConfig, AgentResult, AgentType, ProgressUpdate
+from .plan_cache import PlanCache
 from .tasks import ReasoningChain, Task, TaskList, TaskStatus
 from .workflow import WorkflowExecutor
 
 __all__ = [
     "AgentEngine",
+    "AnswerCache",
     "AgentResult",
     "AgentConfig",
     "AgentType",
+    "LLMEndpoint",
+    "LLMPool",
+    "PlanCache",
     "ProgressUpdate",
     "Task",
     "TaskList",
@@ -4,25 +4,40 @@ import time
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Dict, List, Optional, Union
 
+import httpx
 import logfire
 from pydantic_ai import Agent
 
+from ..llm_pool import LLMPool, resolve_model
 from ..models import AgentConfig, AgentResult, ProgressUpdate, ToolCall
 from ..tasks import Task
 
 
 class BaseAgent(ABC):
-    def __init__(self, config: AgentConfig, tool_bridge: Any, logger: logging.Logger):
+    # Requests one instance may process at a time; subclasses whose
+    # per-request state is isolated can raise this
+    max_concurrency: int = 1
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        tool_bridge: Any,
+        logger: logging.Logger,
+        http_client: Optional[httpx.AsyncClient] = None,
+        llm_pool: Optional[LLMPool] = None,
+    ):
         self.config = config
         self.tool_bridge = tool_bridge
         self.logger = logger or logging.getLogger(f"{self.__class__.__name__}")
+        self.model = resolve_model(config.model, http_client, config.api_key)
+        self.llm_pool = llm_pool
 
         system_prompt = config.system_prompt or self.get_default_system_prompt()
         self.agent: Any = Agent(
-            model=config.model, system_prompt=system_prompt
+            model=self.model, system_prompt=system_prompt
         )  # Type will be overridden in subclasses
 
-        self.is_busy = False
+        self._active_requests = 0
         self.current_task: Optional[Task] = None
         self.available_tools: List[Any] = []
 
@@ -30,6 +45,11 @@ class BaseAgent(ABC):
             f"Initialized {config.agent_type} agent with model {config.model}"
         )
 
+    @property
+    def is_busy(self) -> bool:
+        """Whether the agent is processing at least one request."""
+        return self._active_requests > 0
+
     @abstractmethod
     def get_default_system_prompt(self) -> str:
         """Get the default system prompt for this agent type."""
@@ -44,6 +64,18 @@ class BaseAgent(ABC):
         """Process a request and return results."""
         pass
 
+    async def _run_llm(self, prompt: str, **kwargs: Any) -> Any:
+        """Run the pydantic-ai agent, failing over via the LLM pool if configured."""
+        if self.llm_pool:
+            return await self.llm_pool.run(self.agent, prompt, **kwargs)
+        return await self.agent.run(prompt, **kwargs)
+
+    def _run_llm_stream(self, prompt: str, **kwargs: Any) -> Any:
+        """Streaming counterpart of _run_llm (an async context manager)."""
+        if self.llm_pool:
+            return self.llm_pool.run_stream(self.agent, prompt, **kwargs)
+        return self.agent.run_stream(prompt, **kwargs)
+
     async def initialize(self) -> None:
         """Initialize the agent and load available tools."""
         with logfire.span(f"agent.{self.config.agent_type}.initialize"):
@@ -102,10 +134,10 @@ class BaseAgent(ABC):
         progress_callback: Optional[Callable] = None,
     ) -> AgentResult:
         """Internal implementation of execute_with_progress."""
-        if self.is_busy:
+        if self._active_requests >= self.max_concurrency:
             raise RuntimeError(f"{self.config.agent_type} agent is currently busy")
 
-        self.is_busy = True
+        self._active_requests += 1
         start_time = time.time()
 
         try:
@@ -131,8 +163,9 @@ class BaseAgent(ABC):
                 )
 
             self.logger.info(
-                f"Agent execution completed in {
-                             execution_time:.2f}s with success={result.success}"
+                "Agent execution completed in %.2fs with success=%s",
+                execution_time,
+                result.success,
             )
 
             return result
@@ -160,8 +193,9 @@ class BaseAgent(ABC):
             )
 
         finally:
-            self.is_busy = False
-            self.current_task = None
+            self._active_requests -= 1
+            if not self._active_requests:
+                self.current_task = None
 
     async def execute_tool(
         self,
@@ -195,10 +229,8 @@ class BaseAgent(ABC):
         context: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Internal implementation of tool execution."""
-        self.logger.info(
-            f"Executing tool {
-                         tool_name} with parameters: {parameters}"
-        )
+        # Lazy %-formatting: the parameter repr is only built when INFO is on
+        self.logger.info("Executing tool %s with parameters: %s", tool_name, parameters)
 
         try:
             # Validate parameters with detailed error guidance
@@ -267,8 +299,9 @@ class BaseAgent(ABC):
                 }
 
             self.logger.info(
-                f"Tool {tool_name} executed successfully in {
-                             tool_call.execution_time_seconds:.2f}s"
+                "Tool %s executed successfully in %.2fs",
+                tool_name,
+                tool_call.execution_time_seconds,
             )
 
             return {
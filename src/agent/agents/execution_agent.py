@@ -1,12 +1,17 @@
+import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Union
 
+import httpx
 import logfire
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+from ..llm_pool import LLMPool
 from ..models import AgentConfig, AgentResult, AgentType
 from .base_agent import BaseAgent
 from .orchestrator_agent import ToolExecutionPlan, ToolExecutionStep
@@ -39,20 +44,85 @@ class ExecutionAgent(BaseAgent):
     - Synthesize results into coherent user responses
     - Track execution progress and performance
     - Provide detailed execution reporting
+
+    Plans may run concurrently: the per-plan state below lives in context
+    variables, so each asyncio task executing a plan sees only its own.
     """
 
-    def __init__(self, config: AgentConfig, tool_bridge, logger: logging.Logger):
-        super().__init__(config, tool_bridge, logger)
+    max_concurrency = 4
+
+    def __init__(
+        self,
+        config: AgentConfig,
+        tool_bridge,
+        logger: logging.Logger,
+        http_client: Optional[httpx.AsyncClient] = None,
+        llm_pool: Optional[LLMPool] = None,
+    ):
+        super().__init__(config, tool_bridge, logger, http_client, llm_pool)
 
         self.agent = Agent(
-            model=config.model,
+            model=self.model,
             system_prompt=config.system_prompt or self.get_default_system_prompt(),
             output_type=ExecutionResult,
         )
 
-        self.current_execution_plan: Optional[ToolExecutionPlan] = None
-        self.step_results: List[Dict[str, Any]] = []
-        self.execution_context: Dict[str, Any] = {}
+        self._current_plan: ContextVar[Optional[ToolExecutionPlan]] = ContextVar(
+            f"execution_plan_{id(self)}", default=None
+        )
+        self._step_results: ContextVar[List[Dict[str, Any]]] = ContextVar(
+            f"step_results_{id(self)}"
+        )
+        self._execution_context: ContextVar[Dict[str, Any]] = ContextVar(
+            f"execution_context_{id(self)}"
+        )
+
+        # Optional sink for incremental final_output text during synthesis,
+        # bound per workflow; the lock keeps concurrent syntheses from
+        # interleaving their deltas
+        self._token_callback: ContextVar[
+            Optional[Callable[[str], Awaitable[None]]]
+        ] = ContextVar(f"token_callback_{id(self)}", default=None)
+        self._stream_lock = asyncio.Lock()
+
+    @property
+    def current_execution_plan(self) -> Optional[ToolExecutionPlan]:
+        return self._current_plan.get()
+
+    @current_execution_plan.setter
+    def current_execution_plan(self, plan: Optional[ToolExecutionPlan]) -> None:
+        self._current_plan.set(plan)
+
+    @property
+    def token_callback(self) -> Optional[Callable[[str], Awaitable[None]]]:
+        return self._token_callback.get()
+
+    @contextmanager
+    def streaming_tokens(
+        self, callback: Optional[Callable[[str], Awaitable[None]]]
+    ) -> Iterator[None]:
+        """Send synthesis tokens to callback for plans run in this context."""
+        reset_token = self._token_callback.set(callback)
+        try:
+            yield
+        finally:
+            self._token_callback.reset(reset_token)
+
+    @property
+    def step_results(self) -> List[Dict[str, Any]]:
+        return self._step_results.get([])
+
+    @step_results.setter
+    def step_results(self, results: List[Dict[str, Any]]) -> None:
+        self._step_results.set(results)
+
+    @property
+    def execution_context(self) -> Dict[str, Any]:
+        return self._execution_context.get({})
+
+    @execution_context.setter
+    def execution_context(self, context: Dict[str, Any]) -> None:
+        self._execution_context.set(context)
 
     def get_default_system_prompt(self) -> str:
         """Get the default system prompt for execution agent."""
@@ -133,8 +203,9 @@ Your output should be a comprehensive execution result with clear summaries and
                 raise ValueError("No valid execution plan found in request")
 
             self.logger.info(
-                f"Executing plan for task {execution_plan.task_id} with {
-                             len(execution_plan.execution_steps)} steps"
+                "Executing plan for task %s with %d steps",
+                execution_plan.task_id,
+                len(execution_plan.execution_steps),
             )
 
             # Execute the plan
@@ -232,8 +303,7 @@ Your output should be a comprehensive execution result with clear summaries and
         tool_calls_made = 0
 
         self.logger.info(
-            f"Starting execution of {
-                         total_steps} steps for task {plan.task_id}"
+            "Starting execution of %d steps for task %s", total_steps, plan.task_id
         )
 
         try:
@@ -314,7 +384,7 @@ Your output should be a comprehensive execution result with clear summaries and
         self.step_results.append(step_result)
 
         if step_result["success"]:
-            self.logger.info(f"Step {step.step_number} completed successfully")
+            self.logger.info("Step %s completed successfully", step.step_number)
             return True
         else:
             error_msg = f"Step {step.step_number} failed: {step_result.get('error', 'Unknown error')}"
@@ -362,9 +432,12 @@ Your output should be a comprehensive execution result with clear summaries and
 
         start_time = time.time()
 
+        # Lazy %-formatting: the parameter repr is only built when INFO is on
         self.logger.info(
-            f"Executing step {step_number}: {
-                         step.tool_name} with params {step.parameters}"
+            "Executing step %s: %s with params %s",
+            step_number,
+            step.tool_name,
+            step.parameters,
         )
 
         try:
@@ -459,7 +532,7 @@ Your output should be a comprehensive execution result with clear summaries and
         error_handling = step.error_handling.lower()
 
         if error_handling == "retry_once":
-            self.logger.info(f"Retrying step {step.step_number}")
+            self.logger.info("Retrying step %s", step.step_number)
 
             # Retry the step once
             retry_result = await self._execute_step(step, step.step_number)
@@ -470,12 +543,12 @@ Your output should be a comprehensive execution result with clear summaries and
                 return f"FAILED: Retry of step {step.step_number} failed"
 
         elif error_handling == "skip":
-            self.logger.info(f"Skipping failed step {step.step_number}")
+            self.logger.info("Skipping failed step %s", step.step_number)
             return f"SKIPPED: Step {step.step_number} skipped due to failure"
 
         elif error_handling == "fallback":
             # For now, just log - could implement fallback tool selection
-            self.logger.info(f"Fallback needed for step {step.step_number}")
+            self.logger.info("Fallback needed for step %s", step.step_number)
             return f"FALLBACK: Step {step.step_number} needs fallback implementation"
 
         return f"NO_RECOVERY: No recovery action for step {step.step_number}"
@@ -509,7 +582,15 @@ Focus on being helpful and actionable while translating technical details into u
 
         try:
             # Use the agent to synthesize results
-            response = await self.agent.run(synthesis_prompt)
+            if self.token_callback:
+                async with self._stream_lock:
+                    synthesis_result = await self._stream_synthesis(synthesis_prompt)
+                return {
+                    "summary": synthesis_result.execution_summary,
+                    "final_output": synthesis_result.final_output,
+                }
+
+            response = await self._run_llm(synthesis_prompt)
 
             # Store response for token usage extraction
             if hasattr(response, "output"):
@@ -532,6 +613,26 @@ Focus on being helpful and actionable while translating technical details into u
                 completed_steps, total_steps, plan.task_description
             )
 
+    async def _stream_synthesis(self, synthesis_prompt: str) -> ExecutionResult:
+        """Run synthesis with streamed output, forwarding final_output deltas."""
+
+        token_callback = self.token_callback
+        sent = 0
+        async with self._run_llm_stream(synthesis_prompt) as response:
+            async for partial in response.stream_output(debounce_by=None):
+                text = getattr(partial, "final_output", None) or ""
+                if len(text) > sent:
+                    await token_callback(text[sent:])
+                    sent = len(text)
+
+            output = await response.get_output()
+
+        # Flush anything the last partial did not cover
+        if len(output.final_output) > sent:
+            await token_callback(output.final_output[sent:])
+
+        return output
+
     def _fallback_synthesis(
         self, completed_steps: int, total_steps: int, task_description: str
     ) -> Dict[str, str]:
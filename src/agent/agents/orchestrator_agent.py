@@ -1,11 +1,14 @@
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional, Union
 
+import httpx
 import logfire
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+from ..llm_pool import LLMPool
 from ..models import AgentConfig, AgentResult, AgentType
 from ..tasks import Task, TaskList
 from .base_agent import BaseAgent
@@ -61,15 +64,47 @@ class OrchestratorAgent(BaseAgent):
     - Plan error handling and fallback strategies
     """
 
-    def __init__(self, config: AgentConfig, tool_bridge, logger: logging.Logger):
-        super().__init__(config, tool_bridge, logger)
+    def __init__(
+        self,
+        config: AgentConfig,
+        tool_bridge,
+        logger: logging.Logger,
+        http_client: Optional[httpx.AsyncClient] = None,
+        llm_pool: Optional[LLMPool] = None,
+    ):
+        super().__init__(config, tool_bridge, logger, http_client, llm_pool)
 
         self.agent = Agent(
-            model=config.model,
+            model=self.model,
             system_prompt=config.system_prompt or self.get_default_system_prompt(),
             output_type=ToolExecutionPlan,
         )
 
+        # Tools context fetched ahead of time by prefetch_tools_context()
+        self._tools_context_prefetch: Optional[asyncio.Task] = None
+
+    def prefetch_tools_context(self) -> None:
+        """
+        Start loading the tools context in the background.
+
+        The context does not depend on the plan, so the workflow kicks this
+        off while the planning LLM call is still in flight. A prefetch left
+        over from a run that never reached orchestration is replaced.
+        """
+        if self._tools_context_prefetch is not None:
+            self._tools_context_prefetch.cancel()
+        self._tools_context_prefetch = asyncio.create_task(
+            self._prepare_detailed_tools_context()
+        )
+
+    async def _get_tools_context(self) -> Dict[str, Any]:
+        """Use the prefetched tools context if there is one, else load it now."""
+        prefetch, self._tools_context_prefetch = self._tools_context_prefetch, None
+        with logfire.span("orchestrator_agent.prepare_detailed_tools_context"):
+            if prefetch is not None:
+                return await prefetch
+            return await self._prepare_detailed_tools_context()
+
     def get_default_system_prompt(self) -> str:
         """Get the default system prompt for orchestrator agent."""
         return """You are a tool orchestration specialist responsible for designing optimal tool execution workflows.
@@ -185,15 +220,18 @@ Design comprehensive tool execution plans that achieve task objectives efficient
             )
 
     async def _orchestrate_single_task(
-        self, task: Task, context: Dict[str, Any]
+        self,
+        task: Task,
+        context: Dict[str, Any],
+        tools_context: Optional[Dict[str, Any]] = None,
     ) -> AgentResult:
         """Orchestrate a single task."""
 
         self.logger.info(f"Orchestrating task: {task.description}")
 
         # Prepare context with available tools
-        with logfire.span("orchestrator_agent.prepare_detailed_tools_context"):
-            tools_context = await self._prepare_detailed_tools_context()
+        if tools_context is None:
+            tools_context = await self._get_tools_context()
 
         # Get tool recommendations
         with logfire.span(
@@ -215,7 +253,7 @@ Design comprehensive tool execution plans that achieve task objectives efficient
         with logfire.span(
             "orchestrator_agent.agent_run", prompt_length=len(enhanced_prompt)
         ):
-            response = await self.agent.run(enhanced_prompt)
+            response = await self._run_llm(enhanced_prompt)
 
         # Extract execution plan
         execution_plan = response.output
@@ -265,12 +303,17 @@ Design comprehensive tool execution plans that achieve task objectives efficient
         orchestration_results = []
         total_estimated_duration = 0
 
+        # The tools context is the same for every task in the list
+        tools_context = await self._get_tools_context()
+
         # Orchestrate each task
         with logfire.span(
             "orchestrator_agent.orchestrate_task_list", task_count=len(task_list.tasks)
         ):
-            for task in task_list.tasks:
-                task_result = await self._orchestrate_single_task(task, context)
+            for task in task_list.scheduled_tasks():
+                task_result = await self._orchestrate_single_task(
+                    task, context, tools_context
+                )
                 orchestration_results.append(task_result)
 
                 if task_result.success and task_result.output:
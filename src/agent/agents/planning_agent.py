@@ -2,10 +2,12 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Union
 
+import httpx
 import logfire
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+from ..llm_pool import LLMPool
 from ..models import AgentConfig, AgentResult, AgentType
 
 # Integration moved to app layer
@@ -41,12 +43,19 @@ class PlanningAgent(BaseAgent):
     - Execution strategy formulation
     """
 
-    def __init__(self, config: AgentConfig, tool_bridge, logger: logging.Logger):
-        super().__init__(config, tool_bridge, logger)
+    def __init__(
+        self,
+        config: AgentConfig,
+        tool_bridge,
+        logger: logging.Logger,
+        http_client: Optional[httpx.AsyncClient] = None,
+        llm_pool: Optional[LLMPool] = None,
+    ):
+        super().__init__(config, tool_bridge, logger, http_client, llm_pool)
 
         # Override agent with structured output
         self.agent = Agent(
-            model=config.model,
+            model=self.model,
             system_prompt=config.system_prompt or self.get_default_system_prompt(),
             output_type=TaskPlan,
         )
@@ -123,7 +132,7 @@ Output a comprehensive task plan with clear analysis, approach, and executable t
             with logfire.span(
                 "planning_agent.agent_run", prompt_length=len(enhanced_prompt)
             ):
-                response = await self.agent.run(enhanced_prompt)
+                response = await self._run_llm(enhanced_prompt)
 
             # Extract structured plan
             task_plan = response.output
@@ -253,6 +262,7 @@ Provide a structured analysis and task breakdown."""
         )
 
         # Convert task specifications to Task objects
+        tasks: List[Task] = []
         task_id_mapping = {}  # Map task numbers to actual task IDs
 
         for i, task_spec in enumerate(task_plan.tasks):
@@ -278,7 +288,7 @@ Provide a structured analysis and task breakdown."""
                 description=description,
                 priority=priority,
                 dependencies=[],  # Will be set after all tasks are created
-                tools_required=tools_required,
+                tools_required=tuple(tools_required),
                 estimated_duration_seconds=estimated_duration,
                 metadata={
                     "task_number": i + 1,
@@ -287,7 +297,7 @@ Provide a structured analysis and task breakdown."""
                 },
             )
 
-            task_list.add_task(task)
+            tasks.append(task)
             # Map task number to task ID for dependency resolution
             task_id_mapping[i + 1] = task.id
 
@@ -325,11 +335,22 @@ Provide a structured analysis and task breakdown."""
                                 f"Task {i+1} has invalid dependency format: {dep}"
                             )
 
-            task_list.tasks[i].dependencies = dependencies
+            tasks[i].dependencies = tuple(dict.fromkeys(dependencies))
+
+        # Add tasks only once their dependencies are final, so the task
+        # list's dependency bookkeeping sees the complete graph
+        task_list.bulk_add_tasks(tasks)
 
         # Update execution order based on dependencies
         task_list.execution_order = self._optimize_execution_order(task_list.tasks)
 
+        # Precompute dependency levels once so executors don't poll for
+        # readiness; a cyclic plan keeps the best-effort order above
+        try:
+            task_list.compute_schedule()
+        except ValueError as e:
+            self.logger.warning(f"Could not schedule task plan: {e}")
+
         return task_list
 
     def _optimize_execution_order(self, tasks: List[Task]) -> List[str]:
@@ -400,7 +421,7 @@ Keep the response concise and focused."""
             with logfire.span(
                 "planning_agent.analyze_query_complexity", query_length=len(query)
             ):
-                response = await self.agent.run(simple_prompt)
+                response = await self._run_llm(simple_prompt)
 
             return {
                 "success": True,
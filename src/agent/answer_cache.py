@@ -0,0 +1,120 @@
+"""
+Answer cache for completed workflows.
+
+The plan cache only saves the planning round trip; a repeated question
+still orchestrates and executes every task. The answer cache keeps whole
+completed reasoning chains for a short while so an identical follow-up
+query returns immediately.
+
+Replaying an answer skips its tool calls, so only chains that ran nothing
+but read-only tools are kept.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from .plan_cache import query_key
+from .tasks import ReasoningChain, TaskStatus
+
+
+@dataclass
+class _CachedAnswer:
+    chain: ReasoningChain
+    stored_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+def _executed_tools(chain: ReasoningChain) -> Iterator[str]:
+    """Names of every tool the chain's steps called."""
+    for step in chain.reasoning_steps:
+        for call in step.tool_calls:
+            yield call.tool_name
+        for result in step.output_data.get("execution_results") or ():
+            calls = (
+                result.get("tool_calls")
+                if isinstance(result, dict)
+                else getattr(result, "tool_calls", None)
+            )
+            for call in calls or ():
+                yield call.get("tool_name", "unknown")
+
+
+class AnswerCache:
+    """
+    Exact-match cache of completed reasoning chains, keyed on the
+    normalized query and its context.
+
+    Answers may depend on live tool output, so entries expire after
+    ``ttl_seconds``; when full, the least frequently used entry is evicted.
+    Chains that called any tool outside ``read_only_tools`` are not cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        read_only_tools: Iterable[str] = (),
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.read_only_tools = frozenset(read_only_tools)
+        self._entries: Dict[str, _CachedAnswer] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, query: str, context: Dict[str, Any]) -> Optional[ReasoningChain]:
+        """
+        Get a copy of the chain that answered this query before.
+
+        Returns:
+            The cached chain under a new ID, or None on a miss
+        """
+        key = query_key(query, context)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        entry.hits += 1
+        self.hits += 1
+        # Callers attach the chain to sessions and may update it; sessions,
+        # checkpoints and workflow lookups all key on the chain ID
+        return entry.chain.model_copy(deep=True, update={"id": str(uuid.uuid4())})
+
+    def store(
+        self, query: str, context: Dict[str, Any], chain: ReasoningChain
+    ) -> None:
+        """
+        Cache a chain if it completed using only read-only tools; failed
+        chains are always retried.
+        """
+        if self.max_entries <= 0 or chain.status != TaskStatus.COMPLETED:
+            return
+        if any(name not in self.read_only_tools for name in _executed_tools(chain)):
+            return
+
+        key = query_key(query, context)
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            coldest = min(self._entries, key=lambda k: self._entries[k].hits)
+            del self._entries[coldest]
+        self._entries[key] = _CachedAnswer(chain=chain.model_copy(deep=True))
+
+    def clear(self) -> None:
+        """Drop every cached answer, e.g. after the available tools change."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,81 @@
+"""
+Reasoning chain checkpointing for resume-on-crash.
+
+Each chain gets one JSON file holding its latest snapshot, rewritten on
+every task transition, so a restarted process can pick up from the last
+unfinished task instead of re-running (and re-paying for) completed ones.
+Snapshots are written to a temporary file and renamed over the old one,
+so a crash mid-write never leaves a torn checkpoint.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from .tasks import ReasoningChain, TaskStatus
+
+_TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
+
+class ChainCheckpointer:
+    """Writes and recovers ReasoningChain snapshots under a checkpoint directory."""
+
+    def __init__(
+        self,
+        directory: Path = Path("checkpoints"),
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.directory = directory
+        self.logger = logger or logging.getLogger("ChainCheckpointer")
+        # Tasks may finish concurrently; serializing writes keeps an older
+        # snapshot from replacing a newer one
+        self._lock = asyncio.Lock()
+
+    def _path(self, chain_id: str) -> Path:
+        return self.directory / f"{chain_id}.json"
+
+    async def save(self, chain: ReasoningChain) -> None:
+        """Replace the chain's snapshot; failures are logged, never raised."""
+        try:
+            async with self._lock:
+                data = chain.model_dump_json(fallback=str).encode()
+                await asyncio.to_thread(self._replace, self._path(chain.id), data)
+        except Exception as e:
+            self.logger.warning(f"Failed to checkpoint chain {chain.id}: {e}")
+
+    def _replace(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    async def discard(self, chain_id: str) -> None:
+        """Remove the checkpoint of a chain that no longer needs recovery."""
+        try:
+            async with self._lock:
+                await asyncio.to_thread(self._path(chain_id).unlink, missing_ok=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to discard checkpoint {chain_id}: {e}")
+
+    async def load_unfinished(self) -> List[ReasoningChain]:
+        """Load the snapshot of every chain that never reached a final state."""
+        return await asyncio.to_thread(self._load_unfinished)
+
+    def _load_unfinished(self) -> List[ReasoningChain]:
+        if not self.directory.exists():
+            return []
+
+        chains = []
+        for path in self.directory.glob("*.json"):
+            try:
+                chain = ReasoningChain.model_validate_json(path.read_bytes())
+                if chain.status in _TERMINAL_STATUSES:
+                    continue
+                chains.append(chain)
+
+            except Exception as e:
+                self.logger.warning(f"Skipping unreadable checkpoint {path}: {e}")
+
+        return chains
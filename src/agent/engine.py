@@ -1,11 +1,25 @@
 import asyncio
 import logging
-import os
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
-
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
+
+import httpx
 import logfire
 
-from .models import AgentConfig, AgentType, ProgressUpdate
+from .answer_cache import AnswerCache
+from .checkpoint import ChainCheckpointer
+from .llm_pool import LLMPool
+from .models import AgentConfig, AgentType, ProgressUpdate, to_builtins
+from .plan_cache import PlanCache
 from .tasks import ReasoningChain
 from .workflow import WorkflowExecutor
 
@@ -16,31 +30,46 @@ class AgentEngine:
         default_models: Optional[Dict[str, str]] = None,
         api_key: Optional[str] = None,
         logger: Optional[logging.Logger] = None,
+        llm_pool: Optional[LLMPool] = None,
+        checkpoint_dir: Optional[Path] = Path("checkpoints"),
+        resume_on_startup: bool = False,
+        plan_cache_size: int = 512,
+        answer_cache_size: int = 0,
+        read_only_tools: Iterable[str] = (),
     ):
         """
         Initialize the agent engine with configurable models and API key.
 
         Args:
             default_models: Default models for each agent type
-            api_key: API key for the LLM provider
+            api_key: API key for the LLM provider, passed to each agent's model
+                (never written to the process environment)
             logger: Optional logger instance
+            llm_pool: Optional multi-provider pool; when given, agent LLM calls
+                fail over across its endpoints and default_models falls back to
+                the pool's primary endpoint
+            checkpoint_dir: Directory for reasoning chain checkpoints; None
+                disables checkpointing
+            resume_on_startup: Resume unfinished checkpointed chains when the
+                engine initializes; off by default since resuming re-runs
+                tools from tasks that were in flight at the crash
+            plan_cache_size: Number of plans kept for repeat queries; 0
+                disables the plan cache
+            answer_cache_size: Number of completed answers kept for repeat
+                queries (for ten minutes each); 0 (the default) disables the
+                answer cache
+            read_only_tools: Names of tools without side effects; only answers
+                that called nothing else are cached
         """
         self.logger = logger or logging.getLogger("AgentEngine")
         self.api_key = api_key
+        self.llm_pool = llm_pool
 
-        # Set API key in environment for Pydantic AI
-        if api_key:
-            # Determine which API key environment variable to set based on model names
-            if any("anthropic" in model for model in (default_models or {}).values()):
-                os.environ["ANTHROPIC_API_KEY"] = api_key
-                self.logger.info(
-                    "Set ANTHROPIC_API_KEY environment variable for Pydantic AI"
-                )
-            elif any("openai" in model for model in (default_models or {}).values()):
-                os.environ["OPENAI_API_KEY"] = api_key
-                self.logger.info(
-                    "Set OPENAI_API_KEY environment variable for Pydantic AI"
-                )
+        if llm_pool and not default_models:
+            default_models = {
+                agent_type: llm_pool.primary_model
+                for agent_type in ("planning", "orchestrator", "execution")
+            }
 
         # Default model configuration
         self.default_models = default_models or {
@@ -52,6 +81,27 @@ class AgentEngine:
         # Tool bridge will be injected by the application layer
         self._tool_bridge = None
 
+        # Crash recovery for long-running workflows
+        self._checkpointer = (
+            ChainCheckpointer(checkpoint_dir, self.logger) if checkpoint_dir else None
+        )
+        self.resume_on_startup = resume_on_startup
+        self._resume_task: Optional[asyncio.Task] = None
+
+        # Repeat queries reuse an earlier plan instead of calling the planner
+        self._plan_cache = (
+            PlanCache(max_entries=plan_cache_size) if plan_cache_size > 0 else None
+        )
+        # ... and repeat queries within a few minutes skip the workflow entirely
+        self._answer_cache = (
+            AnswerCache(max_entries=answer_cache_size, read_only_tools=read_only_tools)
+            if answer_cache_size > 0
+            else None
+        )
+
+        # Shared keep-alive HTTP client for all LLM calls (created in initialize())
+        self._http_client: Optional[httpx.AsyncClient] = None
+
         # Workflow executor (initialized in initialize())
         self._workflow_executor: WorkflowExecutor
         self._initialized = False
@@ -85,6 +135,19 @@ class AgentEngine:
             with logfire.span("agent_engine.create_agent_configurations"):
                 agent_configs = self._create_agent_configurations()
 
+            # One pooled HTTP/2 client shared by the planning, orchestrator
+            # and execution agents
+            if self._http_client is None:
+                self._http_client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=100, max_keepalive_connections=50
+                    ),
+                    timeout=60,
+                )
+            if self.llm_pool:
+                self.llm_pool.http_client = self._http_client
+
             # Initialize workflow executor with tool bridge
             with logfire.span("agent_engine.initialize_workflow_executor"):
                 self._workflow_executor = WorkflowExecutor(
@@ -93,34 +156,68 @@ class AgentEngine:
                     orchestrator_config=agent_configs["orchestrator"],
                     execution_config=agent_configs["execution"],
                     logger=self.logger,
+                    http_client=self._http_client,
+                    llm_pool=self.llm_pool,
+                    checkpointer=self._checkpointer,
+                    plan_cache=self._plan_cache,
                 )
                 await self._workflow_executor.initialize()
 
             self._initialized = True
             self.logger.info("AgentEngine initialization completed")
 
+            if self._checkpointer and self.resume_on_startup:
+                unfinished = await self._checkpointer.load_unfinished()
+                if unfinished:
+                    self.logger.info(
+                        f"Found {len(unfinished)} unfinished reasoning chains to resume"
+                    )
+                    self._resume_task = asyncio.create_task(
+                        self._resume_chains(unfinished)
+                    )
+
         except Exception as e:
             self.logger.error(f"Failed to initialize AgentEngine: {e}")
             raise
 
+    async def _resume_chains(self, chains: List[ReasoningChain]) -> None:
+        """Resume checkpointed chains one at a time in the background."""
+
+        async def log_progress(update: ProgressUpdate) -> None:
+            self.logger.debug(f"Resume progress: {update.current_task}")
+
+        for chain in chains:
+            try:
+                await self.process_query(
+                    chain.original_query,
+                    log_progress,
+                    chain.metadata.get("context"),
+                    resume_from=chain,
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to resume reasoning chain {chain.id}: {e}")
+
     def _create_agent_configurations(self) -> Dict[str, AgentConfig]:
         """Create agent configurations with appropriate models and prompts."""
         return {
             "planning": AgentConfig(
                 agent_type=AgentType.PLANNING,
                 model=self.default_models["planning"],
+                api_key=self.api_key,
                 temperature=0.7,
                 max_tokens=4000,
             ),
             "orchestrator": AgentConfig(
                 agent_type=AgentType.ORCHESTRATOR,
                 model=self.default_models["orchestrator"],
+                api_key=self.api_key,
                 temperature=0.3,  # Lower temperature for more deterministic tool selection
                 max_tokens=4000,
             ),
             "execution": AgentConfig(
                 agent_type=AgentType.EXECUTION,
                 model=self.default_models["execution"],
+                api_key=self.api_key,
                 temperature=0.5,
                 max_tokens=4000,
             ),
@@ -131,6 +228,8 @@ class AgentEngine:
         user_query: str,
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
         context: Optional[Dict[str, Any]] = None,
+        resume_from: Optional[ReasoningChain] = None,
+        workflow_id: Optional[str] = None,
     ) -> ReasoningChain:
         """
         Process a user query through the complete multi-agent workflow.
@@ -139,6 +238,9 @@ class AgentEngine:
             user_query: The user's query to process
             context: Optional additional context
             progress_callback: Optional callback for progress updates
+            resume_from: Checkpointed chain to continue instead of starting over
+            workflow_id: ID for the new reasoning chain, so callers can look up
+                the workflow's status while it runs
 
         Returns:
             Complete ReasoningChain with results
@@ -160,7 +262,7 @@ class AgentEngine:
             has_context=context is not None,
         ):
             return await self._process_query_impl(
-                user_query, progress_callback, context
+                user_query, progress_callback, context, resume_from, workflow_id
             )
 
     async def _process_query_impl(
@@ -168,6 +270,8 @@ class AgentEngine:
         user_query: str,
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
         context: Optional[Dict[str, Any]],
+        resume_from: Optional[ReasoningChain] = None,
+        workflow_id: Optional[str] = None,
     ) -> ReasoningChain:
         """Internal implementation of query processing."""
         if not self._initialized:
@@ -175,12 +279,25 @@ class AgentEngine:
                 "AgentEngine must be initialized before processing queries"
             )
 
+        context = context or {}
+        use_answer_cache = self._answer_cache is not None and resume_from is None
+        if use_answer_cache:
+            cached = self._answer_cache.lookup(user_query, context)
+            if cached is not None:
+                self.logger.info("Reusing cached answer for query")
+                await self._send_cached_answer_progress(progress_callback, cached)
+                return cached
+
         try:
             reasoning_chain = await self._workflow_executor.execute_query(
                 user_query=user_query,
-                context=context or {},
+                context=context,
                 progress_callback=progress_callback,
+                resume_from=resume_from,
+                workflow_id=workflow_id,
             )
+            if use_answer_cache:
+                self._answer_cache.store(user_query, context, reasoning_chain)
 
             self.logger.info(
                 f"Query processing completed with status: {
@@ -193,6 +310,30 @@ class AgentEngine:
             self.logger.error(f"Query processing failed: {e}")
             raise
 
+    async def _send_cached_answer_progress(
+        self,
+        progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
+        chain: ReasoningChain,
+    ) -> None:
+        """Report a cached answer the way a finished workflow reports itself."""
+        try:
+            await progress_callback(
+                ProgressUpdate(
+                    agent_type=AgentType.EXECUTION,
+                    status="completed",
+                    progress_percentage=100.0,
+                    current_task="Reused a recent answer to the same query",
+                    elapsed_time_seconds=0.0,
+                    details={
+                        "workflow_stage": "completed",
+                        "reasoning_chain_id": chain.id,
+                        "answer_cache_hit": True,
+                    },
+                )
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to send workflow progress update: {e}")
+
     async def process_query_streaming(
         self, user_query: str, context: Optional[Dict[str, Any]] = None
     ) -> AsyncIterator[Dict[str, Any]]:
@@ -222,7 +363,7 @@ class AgentEngine:
             # Yield any new progress updates
             new_updates = progress_updates[last_update_count:]
             for update in new_updates:
-                yield {"type": "progress", "data": update.model_dump()}
+                yield {"type": "progress", "data": to_builtins(update)}
 
             last_update_count = len(progress_updates)
 
@@ -236,6 +377,44 @@ class AgentEngine:
         except Exception as e:
             yield {"type": "error", "data": {"error": str(e)}}
 
+    async def process_query_stream(
+        self, user_query: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query, streaming result tokens as the LLM produces them.
+
+        Unlike process_query_streaming, progress and token frames are yielded
+        as soon as they arrive instead of waiting for the full ReasoningChain.
+
+        Args:
+            user_query: The user's query to process
+            context: Optional additional context
+
+        Yields:
+            Progress, token and final result frames
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        if not self._workflow_executor:
+            raise RuntimeError("Workflow executor not initialized")
+
+        self.logger.info(f"Streaming user query: {user_query}")
+
+        try:
+            async for delta in self._workflow_executor.stream_execute(
+                user_query, context or {}
+            ):
+                if delta.type == "result":
+                    yield {"type": "result", "data": delta.data.model_dump()}
+                elif delta.type == "progress":
+                    yield {"type": "progress", "data": to_builtins(delta.data)}
+                else:
+                    yield {"type": delta.type, "data": delta.data}
+        except Exception as e:
+            self.logger.error(f"Streaming query processing failed: {e}")
+            yield {"type": "error", "data": {"error": str(e)}}
+
     async def get_available_tools(self) -> List[Dict[str, Any]]:
         """Get information about all available tools via tool bridge."""
         if not self._tool_bridge:
@@ -253,6 +432,14 @@ class AgentEngine:
             for tool in tools
         ]
 
+    async def get_available_tools_json(self) -> bytes:
+        """Get all available tools as pre-serialized JSON bytes (cached)."""
+        if not self._tool_bridge:
+            raise RuntimeError("Tool bridge not configured")
+
+        payload, _ = await self._tool_bridge.get_available_tools_json()
+        return payload
+
     async def execute_single_tool(
         self,
         tool_name: str,
@@ -323,6 +510,13 @@ class AgentEngine:
                 "initialized": self._initialized,
                 "default_models": self.default_models,
                 "tool_bridge_configured": self._tool_bridge is not None,
+                "llm_pool": self.llm_pool.get_status() if self.llm_pool else None,
+                "plan_cache": (
+                    self._plan_cache.get_stats() if self._plan_cache else None
+                ),
+                "answer_cache": (
+                    self._answer_cache.get_stats() if self._answer_cache else None
+                ),
             },
             "workflow_executor": None,
         }
@@ -363,16 +557,17 @@ class AgentEngine:
         self, reasoning_chain: ReasoningChain
     ) -> Dict[str, Any]:
         """Get a summary of a reasoning chain execution."""
+        progress_summary = reasoning_chain.get_progress_summary()
         return {
             "id": reasoning_chain.id,
             "original_query": reasoning_chain.original_query,
             "status": reasoning_chain.status,
             "success": reasoning_chain.status.value == "completed",
             "execution_time_seconds": reasoning_chain.total_execution_time_seconds,
-            "task_count": len(reasoning_chain.task_list.tasks),
-            "reasoning_steps": len(reasoning_chain.reasoning_steps),
+            "task_count": progress_summary["total_tasks"],
+            "reasoning_steps": progress_summary["total_steps"],
             "final_result": reasoning_chain.final_result,
-            "progress_summary": reasoning_chain.get_progress_summary(),
+            "progress_summary": progress_summary,
         }
 
     async def health_check(self) -> Dict[str, Any]:
@@ -405,23 +600,21 @@ class AgentEngine:
             if self._workflow_executor:
                 health_status["workflow_executor"] = "healthy"
 
-                agents_health = await asyncio.gather(
-                    self._workflow_executor.planning_agent.health_check(),
-                    self._workflow_executor.orchestrator_agent.health_check(),
-                    self._workflow_executor.execution_agent.health_check(),
+                # Each check reports its own failure, so one broken agent
+                # never cancels the others' checks
+                agents = {
+                    "planning": self._workflow_executor.planning_agent,
+                    "orchestrator": self._workflow_executor.orchestrator_agent,
+                    "execution": self._workflow_executor.execution_agent,
+                }
+                results = await asyncio.gather(
+                    *(agent.health_check() for agent in agents.values()),
                     return_exceptions=True,
                 )
-
-                for i, agent_type in enumerate(
-                    ["planning", "orchestrator", "execution"]
-                ):
-                    if isinstance(agents_health[i], Exception):
-                        health_status["agents"][
-                            agent_type
-                        ] = f"error: {
-                            agents_health[i]}"
-                    else:
-                        health_status["agents"][agent_type] = agents_health[i]
+                for agent_type, result in zip(agents, results):
+                    health_status["agents"][agent_type] = (
+                        f"error: {result}" if isinstance(result, Exception) else result
+                    )
 
             # Determine overall health
             component_statuses = [
@@ -565,9 +758,16 @@ class AgentEngine:
         """Shutdown the agent engine and cleanup resources."""
         self.logger.info("Shutting down agent engine...")
 
+        if self._resume_task and not self._resume_task.done():
+            self._resume_task.cancel()
+
         if self._initialized and hasattr(self, "_workflow_executor"):
             await self._workflow_executor.cancel_workflow()
 
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
         self._initialized = False
         self._tool_bridge = None
         # Note: _workflow_executor remains available but _initialized=False prevents its use
@@ -0,0 +1,309 @@
+"""
+Multi-provider LLM pool with failover.
+
+Agents normally run against a single hardwired model. The pool keeps a
+prioritised list of provider/model endpoints, tracks their health and
+latency, and fails over to the next endpoint when one errors, is rate
+limited, or has its circuit open.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Union
+
+import httpx
+from pydantic_ai.exceptions import ModelAPIError
+from pydantic_ai.models import Model, infer_model
+from pydantic_ai.providers import infer_provider, infer_provider_class
+
+# Errors that say nothing about the request itself, so another endpoint may
+# succeed: provider API/HTTP status errors, transport failures and timeouts
+_FAILOVER_ERRORS = (
+    ModelAPIError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+    TimeoutError,
+)
+
+
+def resolve_model(
+    model: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    api_key: Optional[str] = None,
+) -> Union[Model, str]:
+    """Bind a "provider:model" name to an explicit API key and shared HTTP client."""
+    provider_kwargs: Dict[str, Any] = {}
+    if http_client is not None:
+        provider_kwargs["http_client"] = http_client
+    if api_key:
+        provider_kwargs["api_key"] = api_key
+
+    if not provider_kwargs:
+        return model
+
+    def provider_factory(provider: str) -> Any:
+        try:
+            return infer_provider_class(provider)(**provider_kwargs)
+        except TypeError as e:
+            # Provider does not accept a custom client or key
+            logging.getLogger("LLMPool").warning(
+                f"Provider {provider} ignores {', '.join(provider_kwargs)}; "
+                f"using its default configuration instead: {e}"
+            )
+            return infer_provider(provider)
+
+    return infer_model(model, provider_factory=provider_factory)
+
+
+@dataclass
+class LLMEndpoint:
+    """A single provider/model the pool can route requests to."""
+
+    provider: str
+    model: str
+    rpm_limit: int = 0  # requests per minute, 0 means unlimited
+    priority: int = 0  # lower values are tried first
+    max_concurrency: int = 8
+    api_key: Optional[str] = field(default=None, repr=False)
+
+    # Runtime health tracking
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    avg_latency_seconds: float = 0.0
+    circuit_opened_at: Optional[float] = None
+    # A trial request is in flight on an open circuit
+    half_open: bool = False
+    _request_times: Deque[float] = field(default_factory=deque, repr=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @property
+    def success_rate(self) -> float:
+        total = self.successes + self.failures
+        return self.successes / total if total else 1.0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def is_rate_limited(self, now: float) -> bool:
+        """Check the sliding one-minute request window against rpm_limit."""
+        while self._request_times and now - self._request_times[0] >= 60.0:
+            self._request_times.popleft()
+        return bool(self.rpm_limit) and len(self._request_times) >= self.rpm_limit
+
+
+class LLMPool:
+    """
+    Load-balances agent LLM calls across providers with a circuit breaker.
+
+    Endpoints are ordered by priority, then success rate and moving-average
+    latency. After ``failure_threshold`` consecutive failures an endpoint's
+    circuit opens and it is skipped until ``reset_timeout_seconds`` have
+    passed, after which a single trial request is allowed through: success
+    closes the circuit, failure opens it for another timeout.
+
+    Only provider API, transport and timeout errors fail over; anything else
+    (e.g. the model's output failing validation) is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[LLMEndpoint],
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 30.0,
+        latency_smoothing: float = 0.2,
+        logger: Optional[logging.Logger] = None,
+    ):
+        if not endpoints:
+            raise ValueError("LLMPool requires at least one endpoint")
+
+        self.endpoints = endpoints
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.latency_smoothing = latency_smoothing
+        self.logger = logger or logging.getLogger("LLMPool")
+
+        # Shared HTTP client, injected by the AgentEngine during initialization
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self._models: Dict[str, Union[Model, str]] = {}
+
+    @property
+    def primary_model(self) -> str:
+        """Name of the highest-priority endpoint."""
+        return min(self.endpoints, key=lambda e: e.priority).name
+
+    def _candidates(self) -> List[LLMEndpoint]:
+        """Endpoints currently eligible for a request, best first."""
+        now = time.monotonic()
+        candidates = []
+
+        for endpoint in self.endpoints:
+            if endpoint.circuit_opened_at is not None and not self._circuit_ready(
+                endpoint, now
+            ):
+                continue
+            if endpoint.is_rate_limited(now):
+                continue
+            candidates.append(endpoint)
+
+        return sorted(
+            candidates,
+            key=lambda e: (e.priority, -e.success_rate, e.avg_latency_seconds),
+        )
+
+    def _circuit_ready(self, endpoint: LLMEndpoint, now: float) -> bool:
+        """Whether an open circuit may take its trial request."""
+        return (
+            not endpoint.half_open
+            and now - endpoint.circuit_opened_at >= self.reset_timeout_seconds
+        )
+
+    def _admit(self, endpoint: LLMEndpoint) -> bool:
+        """
+        Claim a request slot on the endpoint right before calling it.
+
+        An open circuit admits exactly one trial request once its timeout has
+        passed; concurrent callers skip the endpoint until the trial resolves.
+        """
+        if endpoint.circuit_opened_at is None:
+            return True
+        if not self._circuit_ready(endpoint, time.monotonic()):
+            return False
+        endpoint.half_open = True
+        return True
+
+    def _model_for(self, endpoint: LLMEndpoint) -> Union[Model, str]:
+        if endpoint.name not in self._models:
+            self._models[endpoint.name] = resolve_model(
+                endpoint.name, self.http_client, endpoint.api_key
+            )
+        return self._models[endpoint.name]
+
+    def _record_success(self, endpoint: LLMEndpoint, latency: float) -> None:
+        endpoint.successes += 1
+        endpoint.consecutive_failures = 0
+        endpoint.circuit_opened_at = None
+
+        if endpoint.avg_latency_seconds:
+            endpoint.avg_latency_seconds += self.latency_smoothing * (
+                latency - endpoint.avg_latency_seconds
+            )
+        else:
+            endpoint.avg_latency_seconds = latency
+
+    def _record_failure(self, endpoint: LLMEndpoint, error: Exception) -> None:
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+
+        if endpoint.consecutive_failures >= self.failure_threshold:
+            endpoint.circuit_opened_at = time.monotonic()
+            self.logger.warning(
+                f"Circuit opened for {endpoint.name} after {
+                    endpoint.consecutive_failures} consecutive failures: {error}"
+            )
+        else:
+            self.logger.warning(f"LLM call to {endpoint.name} failed: {error}")
+
+    async def run(self, agent: Any, prompt: str, **kwargs: Any) -> Any:
+        """
+        Run a pydantic-ai agent, failing over across endpoints.
+
+        Args:
+            agent: pydantic-ai Agent to run
+            prompt: User prompt for the run
+            **kwargs: Extra arguments forwarded to ``agent.run``
+
+        Returns:
+            The agent run result from the first endpoint that succeeds
+        """
+        last_error: Optional[Exception] = None
+
+        for endpoint in self._candidates():
+            async with endpoint.semaphore:
+                probe = endpoint.circuit_opened_at is not None
+                if not self._admit(endpoint):
+                    continue
+                endpoint._request_times.append(time.monotonic())
+                start_time = time.monotonic()
+                try:
+                    result = await agent.run(
+                        prompt, model=self._model_for(endpoint), **kwargs
+                    )
+                except _FAILOVER_ERRORS as e:
+                    self._record_failure(endpoint, e)
+                    last_error = e
+                    continue
+                finally:
+                    if probe:
+                        endpoint.half_open = False
+
+                self._record_success(endpoint, time.monotonic() - start_time)
+                return result
+
+        if last_error is None:
+            raise RuntimeError("All LLM providers are unavailable")
+        raise RuntimeError(f"All LLM providers failed: {last_error}") from last_error
+
+    @asynccontextmanager
+    async def run_stream(
+        self, agent: Any, prompt: str, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a pydantic-ai agent run on the best available endpoint.
+
+        Streams cannot be replayed once tokens have been forwarded, so there
+        is no failover here; the outcome still counts towards the endpoint's
+        health.
+        """
+        for endpoint in self._candidates():
+            probe = endpoint.circuit_opened_at is not None
+            if self._admit(endpoint):
+                break
+        else:
+            raise RuntimeError("All LLM providers are unavailable")
+
+        try:
+            async with endpoint.semaphore:
+                endpoint._request_times.append(time.monotonic())
+                start_time = time.monotonic()
+                try:
+                    async with agent.run_stream(
+                        prompt, model=self._model_for(endpoint), **kwargs
+                    ) as response:
+                        yield response
+                except _FAILOVER_ERRORS as e:
+                    self._record_failure(endpoint, e)
+                    raise
+
+                self._record_success(endpoint, time.monotonic() - start_time)
+        finally:
+            if probe:
+                endpoint.half_open = False
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Health snapshot of every endpoint."""
+        now = time.monotonic()
+        return [
+            {
+                "name": endpoint.name,
+                "priority": endpoint.priority,
+                "success_rate": endpoint.success_rate,
+                "avg_latency_seconds": endpoint.avg_latency_seconds,
+                "consecutive_failures": endpoint.consecutive_failures,
+                "circuit_open": endpoint.circuit_opened_at is not None
+                and now - endpoint.circuit_opened_at < self.reset_timeout_seconds,
+                "rate_limited": endpoint.is_rate_limited(now),
+            }
+            for endpoint in self.endpoints
+        ]
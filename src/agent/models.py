@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Annotated, Any, Dict, List, Optional, Union
 
+import msgspec
 from pydantic import BaseModel, Field
+from pydantic_core import core_schema
 
 
 class AgentType(str, Enum):
@@ -21,6 +23,12 @@ class AgentConfig(BaseModel):
         description="LLM model to use (e.g., 'anthropic:claude-3-5-sonnet-latest')"
     )
     system_prompt: Optional[str] = None
+    api_key: Optional[str] = Field(
+        default=None,
+        repr=False,
+        exclude=True,
+        description="API key for the model's provider; falls back to the environment",
+    )
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     max_tokens: int = Field(default=4000, gt=0)
     timeout_seconds: int = Field(default=300, gt=0)
@@ -46,40 +54,93 @@ class AgentResult(BaseModel):
         use_enum_values = True
 
 
-class ToolCall(BaseModel):
+def _enc_hook(obj: Any) -> Any:
+    """Fallback encoder for values msgspec does not know (e.g. Pydantic models)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+def to_builtins(obj: Any) -> Any:
+    """Convert a struct (or any value containing structs) to builtin types."""
+    return msgspec.to_builtins(obj, enc_hook=_enc_hook)
+
+
+class HotStruct(msgspec.Struct, kw_only=True):
+    """
+    Base for lightweight records created on the hot streaming path.
+
+    Instances are plain msgspec structs, but they can still be embedded in
+    Pydantic models (e.g. ``Task.tool_calls``): they are validated from dicts
+    on the way in and dumped with msgspec on the way out.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: Any
+    ) -> core_schema.CoreSchema:
+        def validate(value: Any) -> Any:
+            if isinstance(value, cls):
+                return value
+            return msgspec.convert(value, cls)
+
+        return core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                to_builtins
+            ),
+        )
+
+
+class ToolCall(HotStruct, kw_only=True):
     """Represents a tool call made by an agent."""
 
     tool_name: str
     server_id: Optional[str] = None
-    parameters: Dict[str, Any] = Field(default_factory=dict)
+    parameters: Dict[str, Any] = msgspec.field(default_factory=dict)
     result: Optional[Any] = None
     error: Optional[str] = None
     execution_time_seconds: Optional[float] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
 
 
-class AgentMessage(BaseModel):
+class AgentMessage(HotStruct, kw_only=True):
     """Message exchanged between agents or with the system."""
 
     sender: str
     recipient: str
     message_type: str
     content: Union[str, Dict[str, Any]]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
     correlation_id: Optional[str] = None
 
 
-class ProgressUpdate(BaseModel):
+class ProgressUpdate(HotStruct, kw_only=True):
     """Progress update for streaming to WebSocket clients."""
 
     agent_type: AgentType
     status: str
-    progress_percentage: float = Field(ge=0.0, le=100.0)
+    progress_percentage: Annotated[float, msgspec.Meta(ge=0.0, le=100.0)]
     current_task: Optional[str] = None
     elapsed_time_seconds: float
     estimated_remaining_seconds: Optional[float] = None
-    details: Dict[str, Any] = Field(default_factory=dict)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-    class Config:
-        use_enum_values = True
+    details: Dict[str, Any] = msgspec.field(default_factory=dict)
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+
+    def __post_init__(self) -> None:
+        # msgspec only checks annotations when decoding or converting, not
+        # when a struct is built directly
+        if type(self.agent_type) is not AgentType:
+            self.agent_type = AgentType(self.agent_type)
+        if not 0.0 <= self.progress_percentage <= 100.0:
+            raise ValueError(
+                "progress_percentage must be between 0 and 100, got "
+                f"{self.progress_percentage}"
+            )
+
+
+class StreamDelta(HotStruct, kw_only=True):
+    """Incremental item yielded while a workflow streams its execution."""
+
+    type: str  # "progress", "token" or "result"
+    data: Any = None
@@ -0,0 +1,176 @@
+"""
+Plan cache for the planning step.
+
+Planning is a full LLM round trip, yet the same query (give or take
+spacing) with the same context tends to produce the same task breakdown.
+The cache stores successful plans as templates and hands out fresh
+TaskLists for repeat queries.
+"""
+
+import hashlib
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from .tasks import Task, TaskList
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def query_key(query: str, context: Dict[str, Any]) -> str:
+    """
+    Cache key for a query and its context.
+
+    Queries that differ only in spacing share a key; case and punctuation
+    can change what is being asked, so they are kept.
+    """
+    normalized = _WHITESPACE.sub(" ", query.strip())
+    payload = orjson.dumps(
+        [normalized, context], option=orjson.OPT_SORT_KEYS, default=str
+    )
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _planned_copy(task: Task, task_id: str, dependencies: Tuple[str, ...]) -> Task:
+    """Copy only what the planner decided, leaving execution state fresh."""
+    return Task(
+        id=task_id,
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        dependencies=dependencies,
+        assigned_agent=task.assigned_agent,
+        tools_required=task.tools_required,
+        estimated_duration_seconds=task.estimated_duration_seconds,
+        max_retries=task.max_retries,
+        metadata=task.metadata,
+    )
+
+
+@dataclass
+class _PlanTemplate:
+    """A cached plan, with dependencies stored as task positions."""
+
+    name: str
+    metadata: Dict[str, Any]
+    tasks: List[Task]
+    dependencies: List[Tuple[int, ...]]
+    execution_order: List[int]
+    result_metadata: Dict[str, Any]
+    stored_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+class PlanCache:
+    """
+    Exact-match cache of planner output, keyed on the normalized query and
+    its context.
+
+    Entries expire after ``ttl_seconds`` so plans pick up changes to the
+    available tools; when full, the least frequently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, _PlanTemplate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self, query: str, context: Dict[str, Any]
+    ) -> Optional[Tuple[TaskList, Dict[str, Any]]]:
+        """
+        Get a fresh task list for a previously planned query.
+
+        Returns:
+            The task list and the planner's result metadata, or None on a miss
+        """
+        key = query_key(query, context)
+        template = self._entries.get(key)
+        if template is None:
+            self.misses += 1
+            return None
+        if time.monotonic() - template.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        template.hits += 1
+        self.hits += 1
+        return self._instantiate(template), dict(template.result_metadata)
+
+    def store(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        task_list: TaskList,
+        result_metadata: Dict[str, Any],
+    ) -> None:
+        """Cache a freshly planned task list, before any task has run."""
+        if self.max_entries <= 0 or not task_list.tasks:
+            return
+
+        position = {task.id: i for i, task in enumerate(task_list.tasks)}
+        template = _PlanTemplate(
+            name=task_list.name,
+            metadata=dict(task_list.metadata),
+            tasks=[_planned_copy(task, task.id, ()) for task in task_list.tasks],
+            dependencies=[
+                tuple(position[dep] for dep in task.dependencies if dep in position)
+                for task in task_list.tasks
+            ],
+            execution_order=[
+                position[task_id]
+                for task_id in task_list.execution_order
+                if task_id in position
+            ],
+            result_metadata=dict(result_metadata),
+        )
+
+        key = query_key(query, context)
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            coldest = min(self._entries, key=lambda k: self._entries[k].hits)
+            del self._entries[coldest]
+        self._entries[key] = template
+
+    def clear(self) -> None:
+        """Drop every cached plan."""
+        self._entries.clear()
+
+    @staticmethod
+    def _instantiate(template: _PlanTemplate) -> TaskList:
+        # Each use gets new task IDs: chains, checkpoints and progress all
+        # key on them
+        ids = [str(uuid.uuid4()) for _ in template.tasks]
+        tasks = [
+            _planned_copy(planned, task_id, tuple(ids[i] for i in dep_positions))
+            for task_id, planned, dep_positions in zip(
+                ids, template.tasks, template.dependencies
+            )
+        ]
+
+        task_list = TaskList(name=template.name, metadata=dict(template.metadata))
+        task_list.bulk_add_tasks(tasks)
+        task_list.execution_order = [ids[i] for i in template.execution_order]
+        try:
+            task_list.compute_schedule()
+        except ValueError:
+            # The planner already logged the cycle and kept its best-effort
+            # order when the plan was first made
+            pass
+        return task_list
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -5,12 +5,28 @@ Provides task modeling, execution tracking, and reasoning chain orchestration
 for multi-agent workflows.
 """
 
+import heapq
+import time
 import uuid
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
-
-from pydantic import BaseModel, Field, validator
+from functools import lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 
 from .models import AgentType, ToolCall
 
@@ -35,77 +51,150 @@ class TaskPriority(int, Enum):
     CRITICAL = 4
 
 
-class Task(BaseModel):
-    """Individual task within a reasoning chain."""
+class _DumpMixin:
+    """Pydantic-style ``model_dump`` for the slotted dataclasses below."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    title: str = Field(description="Short title for the task")
-    description: str = Field(description="Human-readable task description")
+    __slots__ = ()
+
+    def model_dump(self, mode: str = "python", **kwargs: Any) -> Dict[str, Any]:
+        """Dump to a dict, matching the output of the former Pydantic models."""
+        return _type_adapter(type(self)).dump_python(self, mode=mode, **kwargs)
+
+
+class _ReadOnlyDict(dict):
+    """
+    Empty dict shared as the default of fields that are usually left empty.
+
+    Saves one dict allocation per instance. Such fields are always replaced
+    wholesale when they get data, so the shared default refuses in-place
+    mutation rather than silently leaking into every other instance.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Shared empty default is read-only; assign a new dict")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    # Hashable and copy-proof, so Pydantic shares it instead of deep-copying
+    def __hash__(self) -> int:
+        return 0
+
+    def __copy__(self) -> "_ReadOnlyDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_ReadOnlyDict":
+        return self
+
+    def __reduce__(self) -> str:
+        return "_EMPTY_DICT"
+
+
+_EMPTY_DICT: Dict[str, Any] = _ReadOnlyDict()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(cls: type) -> TypeAdapter:
+    return TypeAdapter(cls)
+
+
+@dataclass(slots=True, kw_only=True)
+class Task(_DumpMixin):
+    """
+    Individual task within a reasoning chain.
+
+    A plain slotted dataclass: construction does no validation. Tasks are
+    validated when a TaskList/ReasoningChain is built from raw data.
+    """
+
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    title: str  # Short title for the task
+    description: str  # Human-readable task description
     status: TaskStatus = TaskStatus.PENDING
     priority: TaskPriority = TaskPriority.MEDIUM
-    dependencies: List[str] = Field(
-        default_factory=list, description="Task IDs that must complete before this task"
-    )
+    # Task IDs that must complete before this task
+    dependencies: Tuple[str, ...] = ()
     assigned_agent: Optional[AgentType] = None
 
     # Execution details
-    tools_required: List[str] = Field(
-        default_factory=list, description="Tools needed for execution"
-    )
+    tools_required: Tuple[str, ...] = ()
     estimated_duration_seconds: Optional[int] = None
     actual_duration_seconds: Optional[float] = None
 
     # Results
     result: Optional[Any] = None
     error: Optional[str] = None
-    tool_calls: List[ToolCall] = Field(default_factory=list)
+    tool_calls: Tuple[ToolCall, ...] = ()
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     retry_count: int = 0
     max_retries: int = 3
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = _EMPTY_DICT
+
+    # Monotonic clock reading at start, used for the duration only
+    _start_monotonic: Annotated[Optional[float], Field(exclude=True)] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    @validator("dependencies")
-    def validate_dependencies(cls, v: List[str]) -> List[str]:
-        """Ensure dependencies don't include self-references."""
-        return list(set(v))  # Remove duplicates
+    def __post_init__(self) -> None:
+        # Remove duplicate dependencies, keep order. Zero or one dependency
+        # (the common case) needs no dedup pass at all.
+        dependencies = self.dependencies
+        if len(dependencies) > 1:
+            unique = tuple(dict.fromkeys(dependencies))
+            if len(unique) != len(dependencies):
+                self.dependencies = unique
+                return
+        if type(dependencies) is not tuple:
+            self.dependencies = tuple(dependencies)
 
     def start_execution(self) -> None:
         """Mark task as started."""
         self.status = TaskStatus.IN_PROGRESS
-        self.started_at = datetime.utcnow()
+        self.started_at = datetime.now(timezone.utc)
+        self._start_monotonic = time.monotonic()
 
     def complete_execution(self, result: Any = None) -> None:
         """Mark task as completed with result."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(timezone.utc)
         self.result = result
-        if self.started_at:
-            self.actual_duration_seconds = (
-                self.completed_at - self.started_at
-            ).total_seconds()
+        if self._start_monotonic is not None:
+            self.actual_duration_seconds = time.monotonic() - self._start_monotonic
 
     def fail_execution(self, error: str) -> None:
         """Mark task as failed with error."""
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(timezone.utc)
         self.error = error
-        if self.started_at:
-            self.actual_duration_seconds = (
-                self.completed_at - self.started_at
-            ).total_seconds()
+        if self._start_monotonic is not None:
+            self.actual_duration_seconds = time.monotonic() - self._start_monotonic
 
     def can_execute(self, completed_task_ids: Set[str]) -> bool:
         """Check if task can be executed based on dependencies."""
-        if self.status != TaskStatus.PENDING:
+        # Statuses are normally enum members, so the identity test settles
+        # it; the string compare only runs for non-pending or raw values
+        status = self.status
+        if status is not TaskStatus.PENDING and status != TaskStatus.PENDING:
             return False
-        return all(dep_id in completed_task_ids for dep_id in self.dependencies)
-
-    class Config:
-        use_enum_values = True
+        # Most tasks are leaves with no dependencies
+        dependencies = self.dependencies
+        if not dependencies:
+            return True
+        # A single dependency is the next most common shape; a plain
+        # membership test skips the issuperset() call and its iterator
+        if len(dependencies) == 1:
+            return dependencies[0] in completed_task_ids
+        return completed_task_ids.issuperset(dependencies)
 
 
 class TaskList(BaseModel):
@@ -121,29 +210,224 @@ class TaskList(BaseModel):
     # Status tracking
     status: TaskStatus = TaskStatus.PENDING
     current_task_id: Optional[str] = None
-    completed_task_ids: Set[str] = Field(default_factory=set)
-    failed_task_ids: Set[str] = Field(default_factory=set)
+    # Lists are cheaper per element than sets and are mostly iterated or
+    # counted; membership goes through the private _completed_lookup set
+    completed_task_ids: List[str] = Field(default_factory=list)
+    failed_task_ids: List[str] = Field(default_factory=list)
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = _EMPTY_DICT
+
+    # Incremental dependency bookkeeping (not serialized)
+    _task_index: Dict[str, Task] = PrivateAttr(default_factory=dict)
+    _pending_deps: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _dependents: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    # Min-heap of (-priority, created_at, task_id): highest priority first
+    _ready_queue: List[Tuple[int, datetime, str]] = PrivateAttr(default_factory=list)
+    # IDs currently in _ready_queue, so a requeued task is never queued twice
+    _queued: Set[str] = PrivateAttr(default_factory=set)
+    _completed_lookup: Set[str] = PrivateAttr(default_factory=set)
+    # Batches of mutually independent task IDs, set by compute_schedule()
+    _levels: List[List[str]] = PrivateAttr(default_factory=list)
+    # Bumped whenever progress changes, so summaries can be cached
+    _version: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build the dependency index for tasks passed at construction."""
+        self._completed_lookup = set(self.completed_task_ids)
+        for task in self.tasks:
+            self._index_task(task)
+
+    def _index_task(self, task: Task) -> None:
+        """Register a task's dependencies and queue it if already ready."""
+        self._task_index[task.id] = task
+        pending = 0
+        for dep_id in task.dependencies:
+            self._dependents.setdefault(dep_id, []).append(task.id)
+            if dep_id not in self._completed_lookup:
+                pending += 1
+        self._pending_deps[task.id] = pending
+
+        if pending == 0 and task.status == TaskStatus.PENDING:
+            self._push_ready(task)
+
+    def _push_ready(self, task: Task) -> None:
+        if task.id in self._queued:
+            return
+        self._queued.add(task.id)
+        heapq.heappush(
+            self._ready_queue, (-int(task.priority), task.created_at, task.id)
+        )
 
     def add_task(self, task: Task) -> None:
         """Add a task to the list."""
-        self.tasks.append(task)
-        if task.id not in self.execution_order:
+        self.bulk_add_tasks((task,))
+
+    def bulk_add_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Add many tasks in one pass, e.g. a whole plan from the planner.
+
+        Raises:
+            ValueError: If a task ID is already in the list or repeated in
+                ``tasks``; nothing is added in that case
+        """
+        tasks = list(tasks)
+        new_ids: Set[str] = set()
+        for task in tasks:
+            if task.id in self._task_index or task.id in new_ids:
+                raise ValueError(f"Duplicate task id: {task.id}")
+            new_ids.add(task.id)
+
+        for task in tasks:
+            self.tasks.append(task)
             self.execution_order.append(task.id)
+            self._index_task(task)
+        self._version += 1
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID."""
-        return next((task for task in self.tasks if task.id == task_id), None)
+        return self._task_index.get(task_id)
+
+    def is_task_completed(self, task_id: str) -> bool:
+        """Check whether a task has been marked completed."""
+        return task_id in self._completed_lookup
+
+    def pop_next_ready(self) -> Optional[Task]:
+        """Pop the highest-priority task whose dependencies are all completed."""
+        while self._ready_queue:
+            _, _, task_id = heapq.heappop(self._ready_queue)
+            self._queued.discard(task_id)
+            task = self._task_index.get(task_id)
+            if (
+                task
+                and (
+                    task.status is TaskStatus.PENDING
+                    or task.status == TaskStatus.PENDING
+                )
+                # A reset dependency can block a task again after it was queued
+                and not self._pending_deps[task_id]
+            ):
+                return task
+        return None
 
     def get_ready_tasks(self) -> List[Task]:
-        """Get tasks that are ready to execute."""
+        """
+        Get tasks that are ready to execute, highest priority first.
+
+        Leaves the ready queue untouched; use pop_next_ready() to take tasks
+        for execution.
+        """
+        ready = []
+        for _, _, task_id in sorted(self._ready_queue):
+            task = self._task_index.get(task_id)
+            if (
+                task
+                and task.status == TaskStatus.PENDING
+                and not self._pending_deps[task_id]
+            ):
+                ready.append(task)
+        return ready
+
+    def reset_task(self, task_id: str) -> None:
+        """
+        Set a task back to PENDING, e.g. to retry it, and requeue it once its
+        dependencies are completed.
+        """
+        task = self._task_index.get(task_id)
+        if task is None:
+            return
+
+        task.status = TaskStatus.PENDING
+        self._version += 1
+        if task_id in self.failed_task_ids:
+            self.failed_task_ids.remove(task_id)
+        if task_id in self._completed_lookup:
+            # Tasks released by its completion have to wait for it again
+            self._completed_lookup.discard(task_id)
+            self.completed_task_ids.remove(task_id)
+            for dependent_id in self._dependents.get(task_id, ()):
+                self._pending_deps[dependent_id] += 1
+
+        if not self._pending_deps.get(task_id):
+            self._push_ready(task)
+
+    def compute_schedule(self) -> List[List[str]]:
+        """
+        Compute the dependency levels of the task graph with Kahn's algorithm.
+
+        Each level holds tasks whose dependencies all sit in earlier levels.
+        If execution_order violates the dependencies, it is replaced with the
+        flattened levels.
+
+        Returns:
+            List of levels, each a list of task IDs
+
+        Raises:
+            ValueError: If the dependencies contain a cycle
+        """
+        indegree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {}
+        for task in self.tasks:
+            known_deps = [dep for dep in task.dependencies if dep in self._task_index]
+            indegree[task.id] = len(known_deps)
+            for dep_id in known_deps:
+                dependents.setdefault(dep_id, []).append(task.id)
+
+        # Tasks without dependencies are the common case; they form level 0
+        frontier = deque(task_id for task_id, deg in indegree.items() if deg == 0)
+        levels: List[List[str]] = []
+        scheduled = 0
+
+        while frontier:
+            level = list(frontier)
+            frontier.clear()
+            levels.append(level)
+            scheduled += len(level)
+
+            for task_id in level:
+                for dependent_id in dependents.get(task_id, ()):
+                    indegree[dependent_id] -= 1
+                    if indegree[dependent_id] == 0:
+                        frontier.append(dependent_id)
+
+        if scheduled < len(indegree):
+            cyclic = [task_id for task_id, deg in indegree.items() if deg > 0]
+            raise ValueError(f"Dependency cycle detected among tasks: {cyclic}")
+
+        level_of = {
+            task_id: depth for depth, level in enumerate(levels) for task_id in level
+        }
+        position = {task_id: i for i, task_id in enumerate(self.execution_order)}
+        order_valid = len(position) == len(level_of) and all(
+            position.get(dep_id, -1) < position.get(task.id, -1)
+            for task in self.tasks
+            for dep_id in task.dependencies
+            if dep_id in level_of
+        )
+        if not order_valid:
+            self.execution_order = [task_id for level in levels for task_id in level]
+
+        self._levels = levels
+        return levels
+
+    def schedule_levels(self) -> List[List[str]]:
+        """Dependency levels from compute_schedule(), empty if not scheduled."""
+        return self._levels
+
+    def scheduled_tasks(self) -> List[Task]:
+        """Tasks in dependency-level order, or list order if not yet scheduled."""
+        if not self._levels:
+            return list(self.tasks)
+
+        present = {task.id for task in self.tasks}
         return [
-            task for task in self.tasks if task.can_execute(self.completed_task_ids)
+            self._task_index[task_id]
+            for level in self._levels
+            for task_id in level
+            if task_id in present
         ]
 
     def get_blocked_tasks(self) -> List[Task]:
@@ -151,19 +435,35 @@ class TaskList(BaseModel):
         return [
             task
             for task in self.tasks
-            if task.status == TaskStatus.PENDING
-            and not task.can_execute(self.completed_task_ids)
+            if task.status == TaskStatus.PENDING and self._pending_deps.get(task.id)
         ]
 
     def mark_task_completed(self, task_id: str) -> None:
-        """Mark a task as completed."""
-        self.completed_task_ids.add(task_id)
-        if task_id in self.failed_task_ids:
-            self.failed_task_ids.remove(task_id)
+        """Mark a task as completed and release tasks waiting on it."""
+        # A retried task may have failed before; one scan, and none at all
+        # in the usual no-failures case
+        if self.failed_task_ids:
+            try:
+                self.failed_task_ids.remove(task_id)
+                self._version += 1
+            except ValueError:
+                pass
+        if task_id in self._completed_lookup:
+            return
+        self._completed_lookup.add(task_id)
+        self.completed_task_ids.append(task_id)
+        self._version += 1
+
+        for dependent_id in self._dependents.get(task_id, ()):
+            self._pending_deps[dependent_id] -= 1
+            if self._pending_deps[dependent_id] == 0:
+                self._push_ready(self._task_index[dependent_id])
 
     def mark_task_failed(self, task_id: str) -> None:
         """Mark a task as failed."""
-        self.failed_task_ids.add(task_id)
+        if task_id not in self.failed_task_ids:
+            self.failed_task_ids.append(task_id)
+            self._version += 1
 
     def get_progress_percentage(self) -> float:
         """Calculate overall progress percentage."""
@@ -174,32 +474,44 @@ class TaskList(BaseModel):
         total = len(self.tasks)
         return (completed / total) * 100.0
 
+    @staticmethod
+    def bulk_progress(task_lists: Sequence["TaskList"]) -> List[float]:
+        """Progress percentages of many task lists, e.g. for a dashboard."""
+        return [
+            len(task_list.completed_task_ids) * 100.0 / len(task_list.tasks)
+            if task_list.tasks
+            else 100.0
+            for task_list in task_lists
+        ]
+
     def is_complete(self) -> bool:
         """Check if all tasks are completed."""
         return len(self.completed_task_ids) == len(self.tasks)
 
     def has_failures(self) -> bool:
         """Check if any tasks have failed."""
-        return len(self.failed_task_ids) > 0
+        return bool(self.failed_task_ids)
 
     class Config:
         use_enum_values = True
 
 
-class ReasoningStep(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ReasoningStep(_DumpMixin):
     """Individual step in a reasoning chain."""
 
     step_number: int
-    title: str = Field(description="Short title for the reasoning step")
+    title: str  # Short title for the reasoning step
     agent_type: AgentType
     description: str
-    input_data: Dict[str, Any] = Field(default_factory=dict)
-    output_data: Dict[str, Any] = Field(default_factory=dict)
+    input_data: Dict[str, Any] = _EMPTY_DICT
+    output_data: Dict[str, Any] = _EMPTY_DICT
     status: TaskStatus = TaskStatus.PENDING
     execution_time_seconds: Optional[float] = None
     error: Optional[str] = None
-    tool_calls: List[ToolCall] = Field(default_factory=list, description="Tool calls made during this step")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    # Tool calls made during this step
+    tool_calls: Tuple[ToolCall, ...] = ()
+    timestamp: datetime = field(default_factory=_utcnow)
 
 
 class ReasoningChain(BaseModel):
@@ -211,7 +523,7 @@ class ReasoningChain(BaseModel):
     reasoning_steps: List[ReasoningStep] = Field(default_factory=list)
 
     # Results
-    intermediate_results: Dict[str, Any] = Field(default_factory=dict)
+    intermediate_results: Dict[str, Any] = _EMPTY_DICT
     final_result: Optional[str] = None
 
     # Status tracking
@@ -224,22 +536,36 @@ class ReasoningChain(BaseModel):
     total_tool_calls: int = 0
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = _EMPTY_DICT
+
+    # Memoized get_progress_summary() and the versions it was built from
+    _version: int = PrivateAttr(default=0)
+    _progress_cache: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _progress_cache_version: int = PrivateAttr(default=-1)
+    _progress_cache_task_version: int = PrivateAttr(default=-1)
+    _step_by_number: Dict[int, ReasoningStep] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Index steps passed at construction (e.g. from a checkpoint)."""
+        for step in self.reasoning_steps:
+            self._step_by_number[step.step_number] = step
 
     def start_chain(self) -> None:
         """Start executing the reasoning chain."""
+        self._version += 1
         self.status = TaskStatus.IN_PROGRESS
-        self.started_at = datetime.utcnow()
+        self.started_at = datetime.now(timezone.utc)
         self.task_list.status = TaskStatus.IN_PROGRESS
         self.task_list.started_at = self.started_at
 
     def complete_chain(self, final_result: str) -> None:
         """Complete the reasoning chain with final result."""
+        self._version += 1
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(timezone.utc)
         self.final_result = final_result
         self.task_list.status = TaskStatus.COMPLETED
         self.task_list.completed_at = self.completed_at
@@ -251,8 +577,9 @@ class ReasoningChain(BaseModel):
 
     def fail_chain(self, error: str) -> None:
         """Fail the reasoning chain with error."""
+        self._version += 1
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(timezone.utc)
         self.task_list.status = TaskStatus.FAILED
         self.task_list.completed_at = self.completed_at
 
@@ -265,6 +592,12 @@ class ReasoningChain(BaseModel):
         """Add a reasoning step."""
         step.step_number = len(self.reasoning_steps) + 1
         self.reasoning_steps.append(step)
+        self._step_by_number[step.step_number] = step
+        self._version += 1
+
+    def get_step(self, step_number: int) -> Optional[ReasoningStep]:
+        """Get a reasoning step by its 1-based step number."""
+        return self._step_by_number.get(step_number)
 
     def get_current_step(self) -> Optional[ReasoningStep]:
         """Get the current reasoning step."""
@@ -276,12 +609,25 @@ class ReasoningChain(BaseModel):
         """Advance to the next reasoning step."""
         if self.current_step < len(self.reasoning_steps) - 1:
             self.current_step += 1
+            self._version += 1
             return True
         return False
 
     def get_progress_summary(self) -> Dict[str, Any]:
-        """Get comprehensive progress summary."""
-        return {
+        """
+        Get comprehensive progress summary.
+
+        The dict is cached until the chain or its task list changes, so
+        callers must treat it as read-only.
+        """
+        if (
+            self._progress_cache is not None
+            and self._progress_cache_version == self._version
+            and self._progress_cache_task_version == self.task_list._version
+        ):
+            return self._progress_cache
+
+        self._progress_cache = {
             "reasoning_chain_id": self.id,
             "status": self.status,
             "current_step": self.current_step + 1,
@@ -292,6 +638,9 @@ class ReasoningChain(BaseModel):
             "execution_time_seconds": self.total_execution_time_seconds,
             "has_failures": self.task_list.has_failures(),
         }
+        self._progress_cache_version = self._version
+        self._progress_cache_task_version = self.task_list._version
+        return self._progress_cache
 
     class Config:
         use_enum_values = True
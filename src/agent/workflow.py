@@ -1,13 +1,96 @@
 import asyncio
+import io
 import logging
 import time
-from typing import Any, Awaitable, Callable, Dict, List, Optional
-
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
 import logfire
 
 from .agents import ExecutionAgent, OrchestratorAgent, PlanningAgent
-from .models import AgentConfig, AgentResult, AgentType, ProgressUpdate
-from .tasks import ReasoningChain, ReasoningStep, TaskList, TaskStatus
+from .checkpoint import ChainCheckpointer
+from .llm_pool import LLMPool
+from .models import AgentConfig, AgentResult, AgentType, ProgressUpdate, StreamDelta
+from .plan_cache import PlanCache
+from .tasks import _EMPTY_DICT, ReasoningChain, ReasoningStep, TaskList, TaskStatus
+
+# Workflow-level progress is reported on behalf of the execution agent
+_WORKFLOW_AGENT_TYPE = AgentType.EXECUTION
+
+# Deltas buffered per stream before token generation waits for the consumer
+_STREAM_QUEUE_SIZE = 64
+
+# (version key, listing) of a cached get_tasks_status/get_reasoning_chain result
+_Snapshot = Tuple[Tuple[Any, ...], List[Dict[str, Any]]]
+
+
+class _ProgressCoalescer:
+    """
+    Delivers workflow and agent progress updates from a background task.
+
+    Neither the workflow nor its agents ever wait on a slow progress sink:
+    updates are parked per (agent, status), where the newest one wins, and
+    the drainer forwards the parked updates in order at most once per
+    ``min_interval`` seconds. Closing flushes whatever is still parked.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[ProgressUpdate], Awaitable[None]],
+        logger: logging.Logger,
+        min_interval: float = 0.1,
+    ):
+        self.callback = callback
+        self.logger = logger
+        self.min_interval = min_interval
+        self._pending: Dict[Tuple[Any, str], ProgressUpdate] = {}
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.create_task(self._drain())
+
+    def put(self, update: ProgressUpdate) -> None:
+        key = (update.agent_type, update.status)
+        # Re-inserting moves a repeated status behind newer ones
+        self._pending.pop(key, None)
+        self._pending[key] = update
+        self._wakeup.set()
+
+    async def send(self, update: ProgressUpdate) -> None:
+        """Progress callback handed to the workflow steps and agents."""
+        self.put(update)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+        await self._task
+
+    async def _drain(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            updates = list(self._pending.values())
+            self._pending.clear()
+            for update in updates:
+                try:
+                    await self.callback(update)
+                except Exception as e:
+                    self.logger.warning(f"Failed to send workflow progress update: {e}")
+
+            if self._closed:
+                if not self._pending:
+                    return
+                continue
+            await asyncio.sleep(self.min_interval)
 
 
 class WorkflowExecutor:
@@ -25,23 +108,40 @@ class WorkflowExecutor:
         orchestrator_config: AgentConfig,
         execution_config: AgentConfig,
         logger: Optional[logging.Logger] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        llm_pool: Optional[LLMPool] = None,
+        checkpointer: Optional[ChainCheckpointer] = None,
+        enable_speculative_orchestration: bool = True,
+        plan_cache: Optional[PlanCache] = None,
     ):
         self.tool_bridge = tool_bridge
         self.logger = logger or logging.getLogger("WorkflowExecutor")
-
-        # Initialize agents with tool bridge - use self.logger to ensure non-None
-        self.planning_agent = PlanningAgent(planning_config, tool_bridge, self.logger)
+        self.checkpointer = checkpointer
+        self.plan_cache = plan_cache
+        self.enable_speculative_orchestration = enable_speculative_orchestration
+
+        # Initialize agents with tool bridge - use self.logger to ensure non-None.
+        # All agents share one HTTP client so their LLM calls reuse connections,
+        # and fail over across providers when an LLM pool is configured.
+        self.planning_agent = PlanningAgent(
+            planning_config, tool_bridge, self.logger, http_client, llm_pool
+        )
         self.orchestrator_agent = OrchestratorAgent(
-            orchestrator_config, tool_bridge, self.logger
+            orchestrator_config, tool_bridge, self.logger, http_client, llm_pool
         )
         self.execution_agent = ExecutionAgent(
-            execution_config, tool_bridge, self.logger
+            execution_config, tool_bridge, self.logger, http_client, llm_pool
         )
 
         # Workflow state
         self.current_reasoning_chain: Optional[ReasoningChain] = None
         self.is_executing = False
 
+        # Last task/step listings handed to pollers, keyed on the chain and
+        # task list versions they were built from
+        self._tasks_snapshot: Optional[_Snapshot] = None
+        self._steps_snapshot: Optional[_Snapshot] = None
+
         self.logger.info("WorkflowExecutor initialized with all agents")
 
     async def initialize(self) -> None:
@@ -54,14 +154,30 @@ class WorkflowExecutor:
         try:
             self.logger.info("Initializing workflow executor and agents")
 
-            # Initialize all agents concurrently
+            # Initialize all agents concurrently. Under the eager task factory
+            # installed in main, initializers that never suspend finish as
+            # soon as gather wraps them in tasks
+            agents = (
+                self.planning_agent,
+                self.orchestrator_agent,
+                self.execution_agent,
+            )
             with logfire.span("workflow_executor.initialize_agents"):
-                await asyncio.gather(
-                    self.planning_agent.initialize(),
-                    self.orchestrator_agent.initialize(),
-                    self.execution_agent.initialize(),
+                results = await asyncio.gather(
+                    *(agent.initialize() for agent in agents), return_exceptions=True
                 )
 
+            errors = []
+            for agent, result in zip(agents, results):
+                if isinstance(result, BaseException):
+                    self.logger.error(
+                        f"Failed to initialize {type(agent).__name__}: {result}"
+                    )
+                    errors.append(result)
+            if errors:
+                # Callers expect the agent's own error
+                raise errors[0]
+
             self.logger.info("All agents initialized successfully")
 
         except Exception as e:
@@ -73,6 +189,9 @@ class WorkflowExecutor:
         user_query: str,
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
         context: Optional[Dict[str, Any]] = None,
+        resume_from: Optional[ReasoningChain] = None,
+        token_callback: Optional[Callable[[str], Awaitable[None]]] = None,
+        workflow_id: Optional[str] = None,
     ) -> ReasoningChain:
         """
         Execute a complete multi-agent workflow for a user query.
@@ -81,6 +200,11 @@ class WorkflowExecutor:
             user_query: The user's query to process
             context: Additional context for processing
             progress_callback: Optional callback for progress updates
+            resume_from: Checkpointed chain to continue; completed tasks are
+                not planned, orchestrated or executed again
+            token_callback: Optional callback for final_output text as the
+                execution agent synthesizes it
+            workflow_id: ID for the new reasoning chain; generated if omitted
 
         Returns:
             Complete ReasoningChain with results
@@ -89,16 +213,83 @@ class WorkflowExecutor:
             raise RuntimeError("Workflow executor is already processing a query")
 
         self.is_executing = True
-        start_time = time.time()
+        start_time = time.monotonic()
+        progress = _ProgressCoalescer(progress_callback, self.logger)
 
-        with logfire.span(
-            "workflow_executor.execute_query",
-            query_length=len(user_query),
-            has_context=context is not None,
-        ):
-            return await self._execute_query_impl(
-                user_query, progress_callback, start_time, context
+        try:
+            with logfire.span(
+                "workflow_executor.execute_query",
+                query_length=len(user_query),
+                has_context=context is not None,
+            ), self.execution_agent.streaming_tokens(token_callback):
+                return await self._execute_query_impl(
+                    user_query,
+                    progress.send,
+                    start_time,
+                    context,
+                    resume_from,
+                    workflow_id,
+                )
+        finally:
+            await progress.aclose()
+
+    async def stream_execute(
+        self, user_query: str, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Execute a workflow, yielding progress, token and result deltas as they occur.
+
+        Tokens are the incremental final_output text produced while the
+        execution agent synthesizes its results.
+
+        Args:
+            user_query: The user's query to process
+            context: Additional context for processing
+
+        Yields:
+            StreamDelta items, ending with a single "result" delta
+        """
+        # Bounded, so a slow consumer pushes back on token generation instead
+        # of letting undelivered deltas pile up in memory
+        queue: asyncio.Queue[StreamDelta] = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+
+        async def progress_callback(update: ProgressUpdate) -> None:
+            # Progress is superseded by the next update anyway; drop it rather
+            # than stall the progress drainer (which must still flush after a
+            # cancelled stream) on a full queue
+            if not queue.full():
+                queue.put_nowait(StreamDelta(type="progress", data=update))
+
+        async def token_callback(text: str) -> None:
+            await queue.put(StreamDelta(type="token", data=text))
+
+        task = asyncio.create_task(
+            self.execute_query(
+                user_query, progress_callback, context, token_callback=token_callback
             )
+        )
+
+        try:
+            while True:
+                if not queue.empty():
+                    yield queue.get_nowait()
+                    continue
+                if task.done():
+                    break
+
+                # Wait for the next delta or for the workflow to finish
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+
+            yield StreamDelta(type="result", data=await task)
+
+        finally:
+            if not task.done():
+                task.cancel()
 
     async def _execute_query_impl(
         self,
@@ -106,76 +297,164 @@ class WorkflowExecutor:
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
         start_time: float,
         context: Optional[Dict[str, Any]],
+        resume_from: Optional[ReasoningChain] = None,
+        workflow_id: Optional[str] = None,
     ) -> ReasoningChain:
         """Internal implementation of query execution."""
-        try:
-            self.logger.info(f"Starting workflow execution for query: {user_query}")
+        # One read-only empty context for the whole query instead of a fresh
+        # dict per step; steps that need a private copy already make one
+        if context is None:
+            context = _EMPTY_DICT
 
-            # TODO
-            # use llm to create a suitable title
+        try:
+            if resume_from and resume_from.task_list.tasks:
+                self.logger.info("Resuming workflow %s from checkpoint", resume_from.id)
+                reasoning_chain = resume_from
+                reasoning_chain.status = TaskStatus.IN_PROGRESS
+                self.current_reasoning_chain = reasoning_chain
+                task_list = reasoning_chain.task_list
+
+                # Checkpoints store enum values; restore the enums callers expect.
+                # Tasks that were running or had failed run again.
+                for task in task_list.tasks:
+                    task.status = TaskStatus(task.status)
+                    if task.status in (TaskStatus.IN_PROGRESS, TaskStatus.FAILED):
+                        task_list.reset_task(task.id)
+                # Dependency levels are not serialized; execution batches by them
+                try:
+                    task_list.compute_schedule()
+                except ValueError as e:
+                    self.logger.warning("Could not schedule resumed plan: %s", e)
+                planning_result = AgentResult(
+                    agent_type=AgentType.PLANNING,
+                    success=True,
+                    output=task_list,
+                    execution_time_seconds=0,
+                    metadata={"resumed": True},
+                )
 
-            reasoning_chain = ReasoningChain(
-                original_query=user_query,
-                task_list=TaskList(name=f"Workflow for: {user_query[:50]}..."),
-            )
-            reasoning_chain.start_chain()
-            self.current_reasoning_chain = reasoning_chain
+            else:
+                self.logger.info(
+                    "Starting workflow execution for query: %s", user_query
+                )
 
-            # Send initial progress update
-            await self._send_workflow_progress(
-                progress_callback, "starting", 0.0, 0.0, "Initializing workflow"
-            )
+                # TODO
+                # use llm to create a suitable title
 
-            # Step 1: Planning
-            with logfire.span("workflow_executor.planning_step"):
-                planning_result = await self._execute_planning_step(
-                    user_query, context or {}, progress_callback
+                reasoning_chain = ReasoningChain(
+                    original_query=user_query,
+                    task_list=TaskList(name=f"Workflow for: {user_query[:50]}..."),
+                    metadata={"context": context},
+                )
+                if workflow_id:
+                    reasoning_chain.id = workflow_id
+                reasoning_chain.start_chain()
+                self.current_reasoning_chain = reasoning_chain
+
+                # Send initial progress update
+                await self._send_workflow_progress(
+                    progress_callback, "starting", 0.0, 0.0, "Initializing workflow"
                 )
 
-            if not planning_result.success:
-                reasoning_chain.fail_chain(f"Planning failed: {planning_result.error}")
-                return reasoning_chain
+                # Orchestration's tool discovery does not depend on the plan;
+                # overlap it with the planning LLM call
+                if self.enable_speculative_orchestration:
+                    self.orchestrator_agent.prefetch_tools_context()
 
-            task_list = planning_result.output
-            if not task_list:
-                reasoning_chain.fail_chain("Planning failed: No task list generated")
-                return reasoning_chain
+                # Step 1: Planning
+                with logfire.span("workflow_executor.planning_step"):
+                    planning_result = await self._execute_planning_step(
+                        user_query, context, progress_callback
+                    )
 
-            reasoning_chain.task_list = task_list
+                if not planning_result.success:
+                    reasoning_chain.fail_chain(
+                        f"Planning failed: {planning_result.error}"
+                    )
+                    await self._checkpoint(reasoning_chain)
+                    return reasoning_chain
+
+                task_list = planning_result.output
+                if not task_list:
+                    reasoning_chain.fail_chain(
+                        "Planning failed: No task list generated"
+                    )
+                    await self._checkpoint(reasoning_chain)
+                    return reasoning_chain
+
+                reasoning_chain.task_list = task_list
+                await self._checkpoint(reasoning_chain)
+
+            # Outputs of tasks finished before a resume are kept, not redone
+            prior_outputs = [
+                task.result
+                for task in task_list.tasks
+                if task_list.is_task_completed(task.id)
+                and isinstance(task.result, str)
+            ]
+            pending_tasks = [
+                task
+                for task in task_list.tasks
+                if not task_list.is_task_completed(task.id)
+            ]
+            if len(pending_tasks) < len(task_list.tasks):
+                # A fresh list, so the chain's own dependency indexes are not
+                # shared with the one orchestration sees
+                remaining = TaskList(
+                    id=task_list.id,
+                    name=task_list.name,
+                    metadata=task_list.metadata,
+                )
+                remaining.bulk_add_tasks(pending_tasks)
+                try:
+                    remaining.compute_schedule()
+                except ValueError as e:
+                    self.logger.warning("Could not schedule resumed tasks: %s", e)
+                task_list = remaining
 
             # Step 2: Orchestration
             orchestration_result = await self._execute_orchestration_step(
-                task_list, context or {}, progress_callback
+                task_list, context, progress_callback
             )
 
             if not orchestration_result.success:
                 reasoning_chain.fail_chain(
                     f"Orchestration failed: {orchestration_result.error}"
                 )
+                await self._checkpoint(reasoning_chain)
                 return reasoning_chain
 
             orchestration_output = orchestration_result.output
             if not orchestration_output:
                 reasoning_chain.fail_chain("Orchestration failed: No output generated")
+                await self._checkpoint(reasoning_chain)
                 return reasoning_chain
 
+            await self._checkpoint(reasoning_chain)
+
             # Step 3: Execution
             execution_result = await self._execute_execution_step(
-                orchestration_output, context or {}, progress_callback
+                orchestration_output, context, progress_callback
             )
 
             if not execution_result.success:
                 reasoning_chain.fail_chain(
                     f"Execution failed: {execution_result.error}"
                 )
+                await self._checkpoint(reasoning_chain)
                 return reasoning_chain
 
             final_output = self._synthesize_final_output(
-                reasoning_chain, planning_result, orchestration_result, execution_result
+                reasoning_chain,
+                planning_result,
+                orchestration_result,
+                execution_result,
+                prior_outputs,
             )
             reasoning_chain.complete_chain(final_output)
+            await self._checkpoint(reasoning_chain)
 
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             await self._send_workflow_progress(
                 progress_callback,
                 "completed",
@@ -185,19 +464,20 @@ class WorkflowExecutor:
             )
 
             self.logger.info(
-                f"Workflow completed successfully in {
-                             reasoning_chain.total_execution_time_seconds:.2f}s"
+                "Workflow completed successfully in %.2fs",
+                reasoning_chain.total_execution_time_seconds,
             )
 
             return reasoning_chain
 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
             error_msg = f"Workflow execution failed: {str(e)}"
             self.logger.error(error_msg)
 
             if self.current_reasoning_chain:
                 self.current_reasoning_chain.fail_chain(error_msg)
+                await self._checkpoint(self.current_reasoning_chain)
 
             # Send error progress update
             await self._send_workflow_progress(
@@ -228,8 +508,7 @@ class WorkflowExecutor:
             input_data={"query": user_query, "context": context},
         )
         planning_step.status = TaskStatus.IN_PROGRESS
-        if self.current_reasoning_chain:
-            self.current_reasoning_chain.add_reasoning_step(planning_step)
+        planning_step = self._add_step(planning_step)
 
         await self._send_workflow_progress(
             progress_callback,
@@ -240,11 +519,37 @@ class WorkflowExecutor:
         )
 
         try:
-            start_time = time.time()
-            planning_result = await self.planning_agent.execute_with_progress(
-                user_query, context, progress_callback
+            start_time = time.monotonic()
+            cached = (
+                self.plan_cache.lookup(user_query, context) if self.plan_cache else None
             )
-            execution_time = time.time() - start_time
+            if cached:
+                # Repeat query: reuse the earlier plan, skipping the LLM call
+                task_list, metadata = cached
+                self.logger.info("Reusing cached plan for query")
+                planning_result = AgentResult(
+                    agent_type=AgentType.PLANNING,
+                    success=True,
+                    output=task_list,
+                    execution_time_seconds=0,
+                    metadata={**metadata, "plan_cache_hit": True},
+                )
+            else:
+                planning_result = await self.planning_agent.execute_with_progress(
+                    user_query, context, progress_callback
+                )
+                if (
+                    self.plan_cache
+                    and planning_result.success
+                    and planning_result.output
+                ):
+                    self.plan_cache.store(
+                        user_query,
+                        context,
+                        planning_result.output,
+                        planning_result.metadata,
+                    )
+            execution_time = time.monotonic() - start_time
 
             planning_step.status = (
                 TaskStatus.COMPLETED if planning_result.success else TaskStatus.FAILED
@@ -268,8 +573,7 @@ class WorkflowExecutor:
                 planning_step.error = planning_result.error
 
             self.logger.info(
-                f"Planning step completed with success={
-                             planning_result.success}"
+                "Planning step completed with success=%s", planning_result.success
             )
 
             return planning_result
@@ -288,8 +592,7 @@ class WorkflowExecutor:
         """Execute the orchestration step of the workflow."""
 
         self.logger.info(
-            f"Executing orchestration step for {
-                         len(task_list.tasks)} tasks"
+            "Executing orchestration step for %d tasks", len(task_list.tasks)
         )
 
         # Create reasoning step
@@ -298,11 +601,10 @@ class WorkflowExecutor:
             title="Orchestration Step",
             agent_type=AgentType.ORCHESTRATOR,
             description="Design tool execution plans for tasks",
-            input_data={"task_list": task_list.model_dump(), "context": context},
+            input_data={"task_list": task_list, "context": context},
         )
         orchestration_step.status = TaskStatus.IN_PROGRESS
-        if self.current_reasoning_chain:
-            self.current_reasoning_chain.add_reasoning_step(orchestration_step)
+        orchestration_step = self._add_step(orchestration_step)
 
         # Send progress update
         await self._send_workflow_progress(
@@ -315,11 +617,11 @@ class WorkflowExecutor:
 
         try:
             # Execute orchestrator agent
-            start_time = time.time()
+            start_time = time.monotonic()
             orchestration_result = await self.orchestrator_agent.execute_with_progress(
                 {"task_list": task_list}, context, progress_callback
             )
-            execution_time = time.time() - start_time
+            execution_time = time.monotonic() - start_time
 
             # Update reasoning step
             orchestration_step.status = (
@@ -346,8 +648,8 @@ class WorkflowExecutor:
                 orchestration_step.error = orchestration_result.error
 
             self.logger.info(
-                f"Orchestration step completed with success={
-                             orchestration_result.success}"
+                "Orchestration step completed with success=%s",
+                orchestration_result.success,
             )
 
             return orchestration_result
@@ -379,8 +681,7 @@ class WorkflowExecutor:
             },
         )
         execution_step.status = TaskStatus.IN_PROGRESS
-        if self.current_reasoning_chain:
-            self.current_reasoning_chain.add_reasoning_step(execution_step)
+        execution_step = self._add_step(execution_step)
 
         # Send progress update
         await self._send_workflow_progress(
@@ -396,69 +697,109 @@ class WorkflowExecutor:
             orchestration_results = orchestration_output.get(
                 "orchestration_results", []
             )
-            execution_results = []
-
-            for i, orchestration_result in enumerate(orchestration_results):
+            total = len(orchestration_results)
+            execution_results: List[Optional[AgentResult]] = [None] * total
+            finished = 0
+            progress_step = 40.0 / total if total else 0.0
+            limit = asyncio.Semaphore(self.execution_agent.max_concurrency)
+
+            async def execute_one(
+                index: int, orchestration_result: AgentResult
+            ) -> None:
+                nonlocal finished
                 if orchestration_result.success and orchestration_result.output:
-
-                    # Send detailed progress update
-                    progress_pct = 50.0 + (i / len(orchestration_results)) * 40.0
-                    await self._send_workflow_progress(
-                        progress_callback,
-                        "executing",
-                        progress_pct,
-                        0.0,
-                        f"Executing task {
-                            i+1}/{len(orchestration_results)}",
-                    )
-
-                    # Execute the plan
-                    exec_result = await self.execution_agent.execute_with_progress(
-                        {"execution_plan": orchestration_result.output},
-                        context,
-                        progress_callback,
-                    )
-                    execution_results.append(exec_result)
+                    try:
+                        async with limit:
+                            exec_result = (
+                                await self.execution_agent.execute_with_progress(
+                                    {"execution_plan": orchestration_result.output},
+                                    context,
+                                    progress_callback,
+                                )
+                            )
+                    except Exception as e:
+                        # e.g. the shared agent is at capacity with plans from
+                        # other workflows; only this task fails
+                        exec_result = AgentResult(
+                            agent_type=AgentType.EXECUTION,
+                            success=False,
+                            error=str(e),
+                            execution_time_seconds=0,
+                        )
                 else:
                     # Create failed result for failed orchestration
-                    failed_result = AgentResult(
+                    exec_result = AgentResult(
                         agent_type=AgentType.EXECUTION,
                         success=False,
                         error=f"Orchestration failed: {
                             orchestration_result.error}",
                         execution_time_seconds=0,
                     )
-                    execution_results.append(failed_result)
 
-            # Aggregate results
-            successful_executions = [r for r in execution_results if r.success]
+                execution_results[index] = exec_result
+                await self._record_task_transition(
+                    orchestration_result.metadata.get("task_id"), exec_result
+                )
 
-            execution_time = sum(r.execution_time_seconds for r in execution_results)
+                finished += 1
+                await self._send_workflow_progress(
+                    progress_callback,
+                    "executing",
+                    50.0 + finished * progress_step,
+                    0.0,
+                    f"Executed task {finished}/{total}",
+                )
+
+            # Plans within a dependency level are independent, so each level
+            # runs concurrently; levels still run in order
+            for batch in self._batch_by_level(orchestration_results):
+                outcomes = await asyncio.gather(
+                    *(execute_one(index, result) for index, result in batch),
+                    return_exceptions=True,
+                )
+                # Recording or reporting a result can still fail; the other
+                # plans in the level have run to completion by now
+                for (index, _), outcome in zip(batch, outcomes):
+                    if not isinstance(outcome, BaseException):
+                        continue
+                    self.logger.error(f"Task execution failed: {outcome}")
+                    if execution_results[index] is None:
+                        execution_results[index] = AgentResult(
+                            agent_type=AgentType.EXECUTION,
+                            success=False,
+                            error=str(outcome),
+                            execution_time_seconds=0,
+                        )
+
+            # Aggregate results in a single pass
+            successful_count = 0
+            execution_time = 0.0
+            for r in execution_results:
+                successful_count += r.success
+                execution_time += r.execution_time_seconds
 
             # Update reasoning step
             execution_step.status = (
-                TaskStatus.COMPLETED
-                if len(successful_executions) > 0
-                else TaskStatus.FAILED
+                TaskStatus.COMPLETED if successful_count > 0 else TaskStatus.FAILED
             )
             execution_step.execution_time_seconds = execution_time
             execution_step.output_data = {
-                "success": len(successful_executions) > 0,
-                "successful_executions": len(successful_executions),
+                "success": successful_count > 0,
+                "successful_executions": successful_count,
                 "total_executions": len(execution_results),
-                "execution_results": [r.model_dump() for r in execution_results],
+                "execution_results": execution_results,
             }
 
-            if len(successful_executions) == 0:
+            if successful_count == 0:
                 execution_step.error = "All task executions failed"
 
             # Create aggregated result
             aggregated_result = AgentResult(
                 agent_type=AgentType.EXECUTION,
-                success=len(successful_executions) > 0,
+                success=successful_count > 0,
                 output={
                     "execution_results": execution_results,
-                    "successful_count": len(successful_executions),
+                    "successful_count": successful_count,
                     "total_count": len(execution_results),
                 },
                 execution_time_seconds=execution_time,
@@ -468,12 +809,13 @@ class WorkflowExecutor:
                 },
             )
 
-            if len(successful_executions) == 0:
+            if successful_count == 0:
                 aggregated_result.error = "All task executions failed"
 
             self.logger.info(
-                f"Execution step completed: {len(
-                successful_executions)}/{len(execution_results)} tasks successful"
+                "Execution step completed: %d/%d tasks successful",
+                successful_count,
+                len(execution_results),
             )
 
             return aggregated_result
@@ -483,12 +825,37 @@ class WorkflowExecutor:
             execution_step.error = str(e)
             raise
 
+    def _batch_by_level(
+        self, orchestration_results: List[AgentResult]
+    ) -> List[List[Tuple[int, AgentResult]]]:
+        """
+        Group orchestration results by the dependency level of their task.
+
+        Without a computed schedule (e.g. the plan had a cycle) every result
+        gets its own batch, preserving the sequential order.
+        """
+        chain = self.current_reasoning_chain
+        levels = chain.task_list.schedule_levels() if chain else []
+        indexed = list(enumerate(orchestration_results))
+        if not levels:
+            return [[item] for item in indexed]
+
+        level_of = {
+            task_id: depth for depth, level in enumerate(levels) for task_id in level
+        }
+        batches: Dict[int, List[Tuple[int, AgentResult]]] = {}
+        for index, result in indexed:
+            depth = level_of.get(result.metadata.get("task_id"), 0)
+            batches.setdefault(depth, []).append((index, result))
+        return [batches[depth] for depth in sorted(batches)]
+
     def _synthesize_final_output(
         self,
         reasoning_chain: ReasoningChain,
         planning_result: AgentResult,
         orchestration_result: AgentResult,
         execution_result: AgentResult,
+        prior_outputs: Optional[List[str]] = None,
     ) -> str:
         """Synthesize the final output from all workflow steps."""
 
@@ -501,26 +868,95 @@ class WorkflowExecutor:
 
         execution_results = execution_data.get("execution_results", [])
 
-        # Collect all successful execution outputs
-        successful_outputs = []
+        # Write successful execution outputs straight into one buffer,
+        # starting with any tasks completed before the workflow was resumed,
+        # rather than collecting them and copying twice through join and the
+        # header f-string
+        buffer = io.StringIO()
+        buffer.write("Here's what I accomplished for your request:")
+        has_output = False
+
+        def write_output(output: str) -> None:
+            nonlocal has_output
+            buffer.write("\n\n")
+            buffer.write(output)
+            has_output = True
+
+        for output in prior_outputs or ():
+            write_output(output)
         for result in execution_results:
             if result.success and result.output:
                 if hasattr(result.output, "final_output"):
-                    successful_outputs.append(result.output.final_output)
+                    write_output(result.output.final_output)
                 elif (
                     isinstance(result.output, dict) and "final_output" in result.output
                 ):
-                    successful_outputs.append(result.output["final_output"])
+                    write_output(result.output["final_output"])
 
-        if successful_outputs:
-            # Combine all outputs
-            combined_output = "\n\n".join(successful_outputs)
-            return f"Here's what I accomplished for your request:\n\n{combined_output}"
+        if has_output:
+            return buffer.getvalue()
         else:
             return (
                 "I completed the requested tasks, but no specific output was generated."
             )
 
+    def _add_step(self, step: ReasoningStep) -> ReasoningStep:
+        """
+        Add a workflow step to the current chain.
+
+        A resumed chain already holds the step from before the restart; that
+        step is restarted in place rather than appended again.
+        """
+        chain = self.current_reasoning_chain
+        if not chain:
+            return step
+
+        existing = chain.get_step(step.step_number)
+        if existing is None:
+            chain.add_reasoning_step(step)
+            return step
+
+        existing.input_data = step.input_data
+        existing.output_data = step.output_data
+        existing.status = step.status
+        existing.error = None
+        existing.timestamp = step.timestamp
+        return existing
+
+    async def _record_task_transition(
+        self, task_id: Optional[str], exec_result: AgentResult
+    ) -> None:
+        """Record a task's outcome on the current chain and checkpoint it."""
+        chain = self.current_reasoning_chain
+        if not chain or not task_id:
+            return
+
+        task = chain.task_list.get_task(task_id)
+        if task:
+            if exec_result.success:
+                output = exec_result.output
+                task.complete_execution(getattr(output, "final_output", output))
+                chain.task_list.mark_task_completed(task_id)
+            else:
+                task.fail_execution(exec_result.error or "Unknown error")
+                chain.task_list.mark_task_failed(task_id)
+
+        await self._checkpoint(chain)
+
+    async def _checkpoint(self, chain: ReasoningChain) -> None:
+        """
+        Persist a snapshot of the chain if checkpointing is enabled.
+
+        Completed and failed chains have nothing left to resume, so their
+        checkpoint is removed instead.
+        """
+        if not self.checkpointer:
+            return
+        if chain.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            await self.checkpointer.discard(chain.id)
+        else:
+            await self.checkpointer.save(chain)
+
     async def _send_workflow_progress(
         self,
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
@@ -531,19 +967,18 @@ class WorkflowExecutor:
     ) -> None:
         """Send workflow progress update."""
         try:
+            chain = self.current_reasoning_chain
+            # ProgressUpdate is a msgspec struct, so construction does no
+            # validation; only the per-call fields are computed here
             update = ProgressUpdate(
-                agent_type=AgentType.EXECUTION,  # Use execution as the workflow coordinator
+                agent_type=_WORKFLOW_AGENT_TYPE,
                 status=status,
                 progress_percentage=progress_percentage,
                 current_task=current_task,
                 elapsed_time_seconds=elapsed_time,
                 details={
                     "workflow_stage": status,
-                    "reasoning_chain_id": (
-                        self.current_reasoning_chain.id
-                        if self.current_reasoning_chain
-                        else "unknown"
-                    ),
+                    "reasoning_chain_id": chain.id if chain else "unknown",
                 },
             )
 
@@ -606,13 +1041,20 @@ class WorkflowExecutor:
         ):
             return []
 
+        # Task states only change through the task list, which bumps its
+        # version, so an unchanged version means an unchanged listing
+        task_list = self.current_reasoning_chain.task_list
+        version = (workflow_id, id(task_list), task_list._version)
+        if self._tasks_snapshot and self._tasks_snapshot[0] == version:
+            return self._tasks_snapshot[1]
+
         tasks = []
-        if self.current_reasoning_chain.task_list:
-            for task in self.current_reasoning_chain.task_list.tasks:
+        if task_list:
+            for task in task_list.tasks:
                 # Get dependency titles by looking up task IDs
                 dep_titles = []
                 for dep_id in task.dependencies:
-                    dep_task = self.current_reasoning_chain.task_list.get_task(dep_id)
+                    dep_task = task_list.get_task(dep_id)
                     if dep_task:
                         dep_titles.append(dep_task.title)
                     else:
@@ -629,6 +1071,8 @@ class WorkflowExecutor:
                         ),
                     }
                 )
+
+        self._tasks_snapshot = (version, tasks)
         return tasks
 
     async def get_reasoning_chain(self, workflow_id: str) -> List[Dict[str, Any]]:
@@ -639,6 +1083,10 @@ class WorkflowExecutor:
         ):
             return []
 
+        version = (workflow_id, self.current_reasoning_chain._version)
+        if self._steps_snapshot and self._steps_snapshot[0] == version:
+            return self._steps_snapshot[1]
+
         steps = []
         for step in self.current_reasoning_chain.reasoning_steps:
             steps.append(
@@ -653,6 +1101,8 @@ class WorkflowExecutor:
                     ),
                 }
             )
+
+        self._steps_snapshot = (version, steps)
         return steps
 
     async def cancel_workflow(self) -> bool:
@@ -12,7 +12,7 @@ This package serves as the main application interface that:
 """
 
 from .coordinator import AppCoordinator
-from .models import AppProgress, AppSession
+from .models import AppProgress, AppSession, SessionMetadata
 from .session import SessionManager
 from .streaming import AppStreamingHandler
 from .handler import WebSocketHandler
@@ -26,4 +26,5 @@ __all__ = [
     "SessionManager",
     "AppSession",
     "AppProgress",
+    "SessionMetadata",
 ]
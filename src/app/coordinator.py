@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import time
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from agent.engine import AgentEngine
 from agent.models import ProgressUpdate
+from agent.plan_cache import query_key
 from agent.tasks import ReasoningChain
 from tools.client import MCPClient
 
@@ -16,6 +20,17 @@ from .models import (
 from .tool_bridge import ToolBridge
 
 
+@dataclass(slots=True)
+class SystemMetrics:
+    """Running totals behind AppCoordinator.get_metrics()."""
+
+    queries_processed: int = 0
+    queries_succeeded: int = 0
+    tools_executed: int = 0
+    # Exact integer total; the average is derived on read
+    total_query_time_ns: int = 0
+
+
 class AppCoordinator:
     """
     Main application coordinator that bridges the agent engine and MCP infrastructure.
@@ -39,13 +54,21 @@ class AppCoordinator:
 
         # System state
         self._initialized = False
-        self._current_workflow_id: Optional[str] = None
-        self._system_metrics = {
-            "queries_processed": 0,
-            "tools_executed": 0,
-            "average_query_time": 0.0,
-            "success_rate": 1.0,
-        }
+        # Queries being processed, keyed like the plan and answer caches, with
+        # their workflow ID and the progress callbacks of every caller waiting
+        # on them
+        self._inflight: Dict[
+            str,
+            Tuple[
+                asyncio.Future[ReasoningChain],
+                List[Callable[[ProgressUpdate], Awaitable[None]]],
+                str,
+            ],
+        ] = {}
+        # Workflow each session is waiting on; the coordinator is shared by
+        # every connection, so status and cancel requests look up their own
+        self._session_workflows: Dict[str, str] = {}
+        self._system_metrics = SystemMetrics()
 
     async def initialize(self) -> None:
         """Initialize the application coordinator and all subsystems."""
@@ -71,6 +94,7 @@ class AppCoordinator:
         user_query: str,
         context: Dict[str, Any],
         progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
+        session_id: Optional[str] = None,
     ) -> ReasoningChain:
         """
         Process a user query through the agent engine with tool integration.
@@ -79,6 +103,8 @@ class AppCoordinator:
             user_query: Natural language query from user
             context: Additional context for query processing
             progress_callback: Optional callback for progress updates
+            session_id: Session the query belongs to; its workflow can then be
+                inspected and cancelled while it runs
 
         Returns:
             Completed reasoning chain with results
@@ -86,36 +112,105 @@ class AppCoordinator:
         if not self._initialized:
             await self.initialize()
 
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         context = context or {}
 
-        self.logger.info(f"Processing query: {user_query}")
+        self.logger.info("Processing query: %s", user_query)
 
         try:
-            reasoning_chain = await self.agent_engine.process_query(
-                user_query=user_query,
-                context=context,
-                progress_callback=progress_callback,
+            reasoning_chain = await self._process_query_once(
+                user_query, context, progress_callback, session_id
             )
 
-            self._current_workflow_id = reasoning_chain.id
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            self._update_metrics(success=True, elapsed_ns=elapsed_ns)
 
-            execution_time = time.time() - start_time
-            self._update_metrics(success=True, execution_time=execution_time)
+            self.logger.info("Query processed successfully in %.2fs", elapsed_ns / 1e9)
+            return reasoning_chain
 
-            self.logger.info(
-                f"Query processed successfully in {
-                             execution_time:.2f}s"
+        except Exception as e:
+            self._update_metrics(
+                success=False, elapsed_ns=time.perf_counter_ns() - start_ns
             )
-            return reasoning_chain
+            self.logger.error("Query processing failed: %s", e)
+            raise
 
+    async def _process_query_once(
+        self,
+        user_query: str,
+        context: Dict[str, Any],
+        progress_callback: Callable[[ProgressUpdate], Awaitable[None]],
+        session_id: Optional[str],
+    ) -> ReasoningChain:
+        """
+        Run a query, joining an identical one that is already in flight.
+
+        The first caller runs the workflow and fans its progress out to every
+        caller waiting on the same query; the others get a copy of its chain.
+        """
+        key = query_key(user_query, context)
+
+        while key in self._inflight:
+            future, callbacks, workflow_id = self._inflight[key]
+            callbacks.append(progress_callback)
+            self._track_workflow(session_id, workflow_id)
+            try:
+                chain = await asyncio.shield(future)
+                return chain.model_copy(deep=True)
+            except asyncio.CancelledError:
+                # The running caller went away; run the query ourselves
+                # unless it was this caller that was cancelled
+                if not future.cancelled():
+                    raise
+            finally:
+                callbacks.remove(progress_callback)
+                self._untrack_workflow(session_id, workflow_id)
+
+        future: asyncio.Future[ReasoningChain] = (
+            asyncio.get_running_loop().create_future()
+        )
+        callbacks = [progress_callback]
+        workflow_id = str(uuid.uuid4())
+        self._inflight[key] = (future, callbacks, workflow_id)
+        self._track_workflow(session_id, workflow_id)
+
+        async def fan_out(update: ProgressUpdate) -> None:
+            for callback in tuple(callbacks):
+                try:
+                    await callback(update)
+                except Exception as e:
+                    self.logger.warning(f"Failed to forward progress update: {e}")
+
+        try:
+            chain = await self.agent_engine.process_query(
+                user_query=user_query,
+                context=context,
+                progress_callback=fan_out,
+                workflow_id=workflow_id,
+            )
+            future.set_result(chain)
+            return chain
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            execution_time = time.time() - start_time
-            self._update_metrics(success=False, execution_time=execution_time)
-            self.logger.error(f"Query processing failed: {e}")
+            future.set_exception(e)
+            # Waiting callers re-raise it; nobody else needs to see it logged
+            future.exception()
             raise
         finally:
-            self._current_workflow_id = None
+            del self._inflight[key]
+            self._untrack_workflow(session_id, workflow_id)
+
+    def _track_workflow(self, session_id: Optional[str], workflow_id: str) -> None:
+        """Record the workflow a session is waiting on."""
+        if session_id is not None:
+            self._session_workflows[session_id] = workflow_id
+
+    def _untrack_workflow(self, session_id: Optional[str], workflow_id: str) -> None:
+        """Forget a session's workflow, unless it has since started another."""
+        if self._session_workflows.get(session_id) == workflow_id:
+            del self._session_workflows[session_id]
 
     async def execute_tool(
         self, request: ToolExecutionRequest
@@ -136,7 +231,7 @@ class AppCoordinator:
 
         try:
             response = await self.tool_bridge.execute_tool_request(request)
-            self._system_metrics["tools_executed"] += 1
+            self._system_metrics.tools_executed += 1
 
             return response
 
@@ -221,6 +316,18 @@ class AppCoordinator:
             self.logger.error(f"Failed to get available tools: {e}")
             return []
 
+    async def get_available_tools_json(self) -> Tuple[bytes, int]:
+        """
+        Get all available tools as cached, pre-serialized JSON.
+
+        Returns:
+            Tuple of (JSON array bytes, number of tools)
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        return await self.tool_bridge.get_available_tools_json()
+
     async def get_system_status(self) -> SystemHealthStatus:
         """
         Get comprehensive system health status.
@@ -232,11 +339,12 @@ class AppCoordinator:
             await self.initialize()
 
         try:
-            # Get server status from tool bridge
-            server_status = await self.tool_bridge.get_server_status()
-
-            # Get agent engine status
-            agent_status = await self.agent_engine.get_system_status()
+            # Tool server and agent engine status are independent; fetch both
+            # at once
+            server_status, agent_status = await asyncio.gather(
+                self.tool_bridge.get_server_status(),
+                self.agent_engine.get_system_status(),
+            )
 
             # Determine overall health
             connected_servers = server_status.get("connected_servers", 0)
@@ -284,56 +392,50 @@ class AppCoordinator:
                 agent_engine_status="error",
             )
 
-    async def cancel_current_workflow(self) -> bool:
+    async def cancel_current_workflow(self, session_id: str) -> bool:
         """
-        Cancel the currently running workflow.
+        Cancel the workflow running for a session.
+
+        Args:
+            session_id: Session whose workflow to cancel
 
         Returns:
             True if workflow was cancelled, False if no workflow was running
         """
-        if not self._current_workflow_id:
+        if session_id not in self._session_workflows:
             return False
 
         try:
             cancelled = await self.agent_engine.cancel_current_workflow()
             if cancelled:
-                self._current_workflow_id = None
-                self.logger.info("Current workflow cancelled")
+                self._session_workflows.pop(session_id, None)
+                self.logger.info("Workflow for session %s cancelled", session_id)
             return cancelled
 
         except Exception as e:
             self.logger.error(f"Failed to cancel workflow: {e}")
             return False
 
-    def _update_metrics(self, success: bool, execution_time: float) -> None:
+    def _update_metrics(self, success: bool, elapsed_ns: int) -> None:
         """Update internal system metrics."""
-        self._system_metrics["queries_processed"] += 1
-
-        # Update average query time (simple moving average)
-        current_avg = self._system_metrics["average_query_time"]
-        query_count = self._system_metrics["queries_processed"]
-        self._system_metrics["average_query_time"] = (
-            current_avg * (query_count - 1) + execution_time
-        ) / query_count
-
-        # Update success rate
-        if success:
-            current_success_rate = self._system_metrics["success_rate"]
-            self._system_metrics["success_rate"] = (
-                current_success_rate * (query_count - 1) + 1.0
-            ) / query_count
-        else:
-            current_success_rate = self._system_metrics["success_rate"]
-            self._system_metrics["success_rate"] = (
-                current_success_rate * (query_count - 1) + 0.0
-            ) / query_count
+        metrics = self._system_metrics
+        metrics.queries_processed += 1
+        metrics.queries_succeeded += success
+        metrics.total_query_time_ns += elapsed_ns
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get current system metrics."""
+        metrics = self._system_metrics
+        queries = metrics.queries_processed
         return {
-            **self._system_metrics,
+            "queries_processed": queries,
+            "tools_executed": metrics.tools_executed,
+            "average_query_time": (
+                metrics.total_query_time_ns / queries / 1e9 if queries else 0.0
+            ),
+            "success_rate": metrics.queries_succeeded / queries if queries else 1.0,
             "initialized": self._initialized,
-            "current_workflow_active": self._current_workflow_id is not None,
+            "current_workflow_active": bool(self._session_workflows),
         }
 
     async def get_agents_status(self) -> List[Dict[str, Any]]:
@@ -348,42 +450,43 @@ class AppCoordinator:
             self.logger.error(f"Failed to get agents status: {e}")
             return []
 
-    async def get_workflow_status(self) -> Optional[Dict[str, Any]]:
-        """Get current workflow status."""
-        if not self._current_workflow_id:
+    async def get_workflow_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status of the workflow running for a session."""
+        workflow_id = self._session_workflows.get(session_id)
+        if not workflow_id:
             return None
 
         try:
             workflow_status = await self.agent_engine.get_workflow_status(
-                self._current_workflow_id
+                workflow_id
             )
             return workflow_status
         except Exception as e:
             self.logger.error(f"Failed to get workflow status: {e}")
             return None
 
-    async def get_tasks_status(self) -> List[Dict[str, Any]]:
-        """Get current tasks status."""
-        if not self._current_workflow_id:
+    async def get_tasks_status(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get the tasks of the workflow running for a session."""
+        workflow_id = self._session_workflows.get(session_id)
+        if not workflow_id:
             return []
 
         try:
-            tasks_status = await self.agent_engine.get_tasks_status(
-                self._current_workflow_id
-            )
+            tasks_status = await self.agent_engine.get_tasks_status(workflow_id)
             return tasks_status
         except Exception as e:
             self.logger.error(f"Failed to get tasks status: {e}")
             return []
 
-    async def get_reasoning_chain(self) -> List[Dict[str, Any]]:
-        """Get current reasoning chain."""
-        if not self._current_workflow_id:
+    async def get_reasoning_chain(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get the reasoning chain of the workflow running for a session."""
+        workflow_id = self._session_workflows.get(session_id)
+        if not workflow_id:
             return []
 
         try:
             reasoning_chain = await self.agent_engine.get_reasoning_chain(
-                self._current_workflow_id
+                workflow_id
             )
             return reasoning_chain
         except Exception as e:
@@ -413,8 +516,12 @@ class AppCoordinator:
         self.logger.info("Shutting down application coordinator...")
 
         # Cancel any running workflow
-        if self._current_workflow_id:
-            await self.cancel_current_workflow()
+        if self._session_workflows:
+            try:
+                await self.agent_engine.cancel_current_workflow()
+            except Exception as e:
+                self.logger.error(f"Failed to cancel workflow: {e}")
+            self._session_workflows.clear()
 
         # Shutdown agent engine
         if hasattr(self.agent_engine, "shutdown"):
@@ -1,8 +1,18 @@
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import orjson
 
 from .coordinator import AppCoordinator
-from .streaming import AppStreamingHandler
+from .streaming import AppStreamingHandler, safe_json_serialize
+
+# (websocket, session_id, command_data) -> None
+CommandHandler = Callable[[Any, str, Dict[str, Any]], Awaitable[None]]
+
+# Agent status is the same for every client and is polled far more often
+# than it changes; replies within this window share one fetch and encoding
+_STATUS_TTL_SECONDS = 0.5
 
 
 class WebSocketHandler:
@@ -18,6 +28,28 @@ class WebSocketHandler:
         self.streaming_handler = AppStreamingHandler(app_coordinator, logger)
         self.logger = logger or logging.getLogger("WebSocketHandler")
 
+        # Map commands to handlers, bound once rather than per message
+        self._command_handlers: Dict[str, CommandHandler] = {
+            "agent_query": self._handle_agent_query,
+            "query": self._handle_agent_query,  # Route legacy "query" command to agent_query
+            "tool_execute": self._handle_tool_execute,
+            "complexity_analysis": self._handle_complexity_analysis,
+            "get_available_tools": self._handle_get_tools,
+            "system_status": self._handle_system_status,
+            "cancel_workflow": self._handle_cancel_workflow,
+            "set_wire_format": self._handle_set_wire_format,
+            # Agent-specific commands
+            "get_agents": self._handle_get_agents,
+            "get_workflow": self._handle_get_workflow,
+            "get_tasks": self._handle_get_tasks,
+            "get_reasoning": self._handle_get_reasoning,
+            "get_planning": self._handle_get_planning,
+            "get_execution": self._handle_get_execution,
+        }
+
+        # key -> (fetched at, status, status encoded as JSON)
+        self._status_cache: Dict[str, Tuple[float, Any, bytes]] = {}
+
     async def initialize(self) -> None:
         """Initialize the application coordinator for WebSocket integration."""
         await self.app_coordinator.initialize()
@@ -37,34 +69,16 @@ class WebSocketHandler:
         command = command_data.get("command", "")
         session_id = command_data.get("session_id", "unknown")
 
-        # Map commands to handlers
-        command_handlers = {
-            "agent_query": self._handle_agent_query,
-            "query": self._handle_agent_query,  # Route legacy "query" command to agent_query
-            "tool_execute": self._handle_tool_execute,
-            "complexity_analysis": self._handle_complexity_analysis,
-            "get_available_tools": self._handle_get_tools,
-            "system_status": self._handle_system_status,
-            "cancel_workflow": self._handle_cancel_workflow,
-            # Agent-specific commands
-            "get_agents": self._handle_get_agents,
-            "get_workflow": self._handle_get_workflow,
-            "get_tasks": self._handle_get_tasks,
-            "get_reasoning": self._handle_get_reasoning,
-            "get_planning": self._handle_get_planning,
-            "get_execution": self._handle_get_execution,
-        }
-
-        if command in command_handlers:
-            try:
-                await command_handlers[command](websocket, session_id, command_data)
-                return True
-            except Exception as e:
-                self.logger.error(f"Error handling app command {command}: {e}")
-                await self.streaming_handler._send_error(websocket, str(e), session_id)
-                return True
+        handler = self._command_handlers.get(command)
+        if handler is None:
+            return False
 
-        return False
+        try:
+            await handler(websocket, session_id, command_data)
+        except Exception as e:
+            self.logger.error(f"Error handling app command {command}: {e}")
+            await self.streaming_handler._send_error(websocket, str(e), session_id)
+        return True
 
     async def _handle_agent_query(
         self, websocket, session_id: str, command_data: Dict[str, Any]
@@ -108,20 +122,45 @@ class WebSocketHandler:
         """Handle cancel workflow command."""
         await self.streaming_handler.handle_cancel_workflow(websocket, session_id)
 
+    async def _handle_set_wire_format(
+        self, websocket, session_id: str, command_data: Dict[str, Any]
+    ) -> None:
+        """Handle wire format selection command."""
+        await self.streaming_handler.handle_set_wire_format(
+            websocket, session_id, command_data.get("format", "json")
+        )
+
+    async def _cached_status(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bytes]:
+        """Get a global status and its JSON encoding, refetched at most once per TTL."""
+        now = time.monotonic()
+        cached = self._status_cache.get(key)
+        if cached is not None and now - cached[0] < _STATUS_TTL_SECONDS:
+            return cached[1], cached[2]
+
+        status = await fetch()
+        status_json = orjson.dumps(
+            status, default=safe_json_serialize, option=orjson.OPT_NON_STR_KEYS
+        )
+        self._status_cache[key] = (now, status, status_json)
+        return status, status_json
+
     async def _handle_get_agents(
         self, websocket, session_id: str, _command_data: Dict[str, Any]
     ) -> None:
         """Handle get agents status command."""
         try:
-            agents_info = await self.app_coordinator.get_agents_status()
+            agents_info, agents_info_json = await self._cached_status(
+                "agents", self.app_coordinator.get_agents_status
+            )
 
-            await self.streaming_handler._send_message(
+            await self.streaming_handler._send_spliced(
                 websocket,
-                {
-                    "type": "agents_status",
-                    "session_id": session_id,
-                    "agents": agents_info,
-                },
+                {"type": "agents_status", "session_id": session_id},
+                "agents",
+                agents_info,
+                agents_info_json,
             )
 
         except Exception as e:
@@ -133,7 +172,7 @@ class WebSocketHandler:
     ) -> None:
         """Handle get workflow status command."""
         try:
-            workflow_info = await self.app_coordinator.get_workflow_status()
+            workflow_info = await self.app_coordinator.get_workflow_status(session_id)
 
             await self.streaming_handler._send_message(
                 websocket,
@@ -153,7 +192,7 @@ class WebSocketHandler:
     ) -> None:
         """Handle get tasks status command."""
         try:
-            tasks_info = await self.app_coordinator.get_tasks_status()
+            tasks_info = await self.app_coordinator.get_tasks_status(session_id)
 
             await self.streaming_handler._send_message(
                 websocket,
@@ -169,7 +208,7 @@ class WebSocketHandler:
     ) -> None:
         """Handle get reasoning chain command."""
         try:
-            reasoning_info = await self.app_coordinator.get_reasoning_chain()
+            reasoning_info = await self.app_coordinator.get_reasoning_chain(session_id)
 
             await self.streaming_handler._send_message(
                 websocket,
@@ -189,15 +228,16 @@ class WebSocketHandler:
     ) -> None:
         """Handle get planning agent status command."""
         try:
-            planning_info = await self.app_coordinator.get_planning_status()
+            planning_info, planning_info_json = await self._cached_status(
+                "planning", self.app_coordinator.get_planning_status
+            )
 
-            await self.streaming_handler._send_message(
+            await self.streaming_handler._send_spliced(
                 websocket,
-                {
-                    "type": "planning_status",
-                    "session_id": session_id,
-                    "planning": planning_info,
-                },
+                {"type": "planning_status", "session_id": session_id},
+                "planning",
+                planning_info,
+                planning_info_json,
             )
 
         except Exception as e:
@@ -209,15 +249,16 @@ class WebSocketHandler:
     ) -> None:
         """Handle get execution agent status command."""
         try:
-            execution_info = await self.app_coordinator.get_execution_status()
+            execution_info, execution_info_json = await self._cached_status(
+                "execution", self.app_coordinator.get_execution_status
+            )
 
-            await self.streaming_handler._send_message(
+            await self.streaming_handler._send_spliced(
                 websocket,
-                {
-                    "type": "execution_status",
-                    "session_id": session_id,
-                    "execution": execution_info,
-                },
+                {"type": "execution_status", "session_id": session_id},
+                "execution",
+                execution_info,
+                execution_info_json,
             )
 
         except Exception as e:
@@ -5,16 +5,21 @@ Defines data structures for session management, progress tracking,
 and application state coordination.
 """
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from agent.models import ProgressUpdate
+from agent.models import AgentType, ProgressUpdate
 from agent.tasks import ReasoningChain
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class SessionStatus(str, Enum):
     """Status of an application session."""
 
@@ -26,6 +31,18 @@ class SessionStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class SessionMetadata(BaseModel):
+    """Known session metadata; caller-supplied context is kept in ``extras``."""
+
+    # Latest progress update; its percentage and current task live on the
+    # session itself
+    agent_type: Optional[AgentType] = None
+    elapsed_time: Optional[float] = None
+
+    websocket_closed: bool = False
+    extras: Dict[str, Any] = Field(default_factory=dict)
+
+
 class AppSession(BaseModel):
     """Application session for tracking user interactions."""
 
@@ -39,36 +56,45 @@ class AppSession(BaseModel):
     progress_percentage: float = 0.0
 
     # Timing
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Set by the SessionManager from its session timeout
+    expiry_at: Optional[datetime] = None
 
     # Results
     final_result: Optional[str] = None
     error_message: Optional[str] = None
 
     # Metadata
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: SessionMetadata = Field(default_factory=SessionMetadata)
+
+    # Monotonic start of the current query; not persisted
+    _started_monotonic: Optional[float] = PrivateAttr(default=None)
 
     @property
     def duration_seconds(self) -> Optional[float]:
         """Calculate session duration."""
         if self.started_at and self.completed_at:
             return (self.completed_at - self.started_at).total_seconds()
+        elif self._started_monotonic is not None:
+            return time.monotonic() - self._started_monotonic
         elif self.started_at:
-            return (datetime.utcnow() - self.started_at).total_seconds()
+            # Reloaded from storage while still processing
+            return (_utcnow() - self.started_at).total_seconds()
         return None
 
     def start_processing(self, query: str) -> None:
         """Start processing a query."""
         self.status = SessionStatus.PROCESSING
         self.user_query = query
-        self.started_at = datetime.utcnow()
+        self.started_at = _utcnow()
+        self._started_monotonic = time.monotonic()
 
     def complete_processing(self, result: str, reasoning_chain: ReasoningChain) -> None:
         """Complete processing with result."""
         self.status = SessionStatus.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = _utcnow()
         self.final_result = result
         self.reasoning_chain_id = reasoning_chain.id
         self.progress_percentage = 100.0
@@ -76,27 +102,23 @@ class AppSession(BaseModel):
     def fail_processing(self, error: str) -> None:
         """Fail processing with error."""
         self.status = SessionStatus.FAILED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = _utcnow()
         self.error_message = error
 
     def cancel_processing(self) -> None:
         """Cancel processing."""
         self.status = SessionStatus.CANCELLED
-        self.completed_at = datetime.utcnow()
+        self.completed_at = _utcnow()
 
     def update_progress(self, update: ProgressUpdate) -> None:
         """Update session progress."""
         self.progress_percentage = update.progress_percentage
         self.current_step = update.current_task
 
-        # Update metadata with progress details
-        self.metadata.update(
-            {
-                "last_progress_update": update.model_dump(),
-                "agent_type": update.agent_type,
-                "elapsed_time": update.elapsed_time_seconds,
-            }
-        )
+        # Only the latest headline fields are kept: the session is persisted
+        # on every tick, and update details can be large
+        self.metadata.agent_type = update.agent_type
+        self.metadata.elapsed_time = update.elapsed_time_seconds
 
 
 class AppProgress(BaseModel):
@@ -116,7 +138,7 @@ class AppProgress(BaseModel):
 
     # Context
     details: Dict[str, Any] = Field(default_factory=dict)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class ToolExecutionRequest(BaseModel):
@@ -162,5 +184,5 @@ class SystemHealthStatus(BaseModel):
     tool_servers_connected: int
     total_tool_servers: int
     agent_engine_status: str
-    last_check_timestamp: datetime = Field(default_factory=datetime.utcnow)
+    last_check_timestamp: datetime = Field(default_factory=_utcnow)
     issues: List[str] = Field(default_factory=list)
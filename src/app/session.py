@@ -1,14 +1,53 @@
-import json
+import asyncio
+import heapq
 import logging
+import sqlite3
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from agent.models import ProgressUpdate
 from agent.tasks import ReasoningChain
 
-from .models import AppProgress, AppSession, SessionStatus
+from .models import AppProgress, AppSession, SessionMetadata, SessionStatus
+
+# One row per session; the full session is kept as a JSON payload and only
+# the columns needed for history queries and cleanup are broken out
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+-- History pages (optionally by status) and age-based cleanup read these in
+-- order instead of sorting the whole table
+CREATE INDEX IF NOT EXISTS sessions_by_update ON sessions (updated_at);
+CREATE INDEX IF NOT EXISTS sessions_by_status ON sessions (status, updated_at);
+"""
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO sessions (id, status, updated_at, payload)"
+    " VALUES (?, ?, ?, ?)"
+)
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=3000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+_FINAL_STATUSES = (
+    SessionStatus.COMPLETED,
+    SessionStatus.FAILED,
+    SessionStatus.CANCELLED,
+)
 
 
 class SessionManager:
@@ -22,16 +61,38 @@ class SessionManager:
         storage_path: Optional[Path] = None,
         session_timeout_hours: int = 24,
         logger: Optional[logging.Logger] = None,
+        flush_interval_seconds: float = 0.2,
+        max_active_sessions: int = 1024,
     ):
         self.logger = logger or logging.getLogger("SessionManager")
         self.session_timeout_hours = session_timeout_hours
+        self._session_timeout = timedelta(hours=session_timeout_hours)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_active_sessions = max_active_sessions
 
         # Setup storage
         self.storage_path = storage_path or Path.home() / ".brain" / "sessions"
         self.storage_path.mkdir(parents=True, exist_ok=True)
-
-        # Active sessions in memory
-        self._active_sessions: Dict[str, AppSession] = {}
+        self._db = self._open_db(self.storage_path / "sessions.db")
+        # Commits run in a worker thread; the connection is shared with the
+        # event loop's reads, so every use goes through this lock
+        self._db_lock = threading.Lock()
+
+        # Write-behind buffer: progress ticks only mark a session dirty and a
+        # background task writes every dirty session in one transaction
+        self._pending: Dict[str, AppSession] = {}
+        # Sessions taken from _pending whose write has not committed yet
+        self._writing: Dict[str, AppSession] = {}
+        self._pending_event = asyncio.Event()
+        # Keeps flushes in order, so an older snapshot never lands last
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Active sessions in memory, least recently used first
+        self._active_sessions: OrderedDict[str, AppSession] = OrderedDict()
+        # (expiry time, session id) for sessions added to memory; entries for
+        # sessions evicted or removed since are skipped when popped
+        self._expiry_heap: List[Tuple[datetime, str]] = []
 
         # Session metrics
         self._session_metrics = {
@@ -53,21 +114,22 @@ class SessionManager:
         """
         session_id = str(uuid.uuid4())
 
-        session = AppSession(
+        # Every field is known-good here, so skip validation
+        session = AppSession.model_construct(
             session_id=session_id,
             status=SessionStatus.READY,
-            metadata=initial_context or {},
+            metadata=SessionMetadata(extras=initial_context or {}),
         )
+        session.expiry_at = session.created_at + self._session_timeout
 
         # Store in memory
-        self._active_sessions[session_id] = session
+        self._remember_session(session)
 
         # Persist to disk
         await self._persist_session(session)
 
         # Update metrics
         self._session_metrics["total_created"] += 1
-        self._session_metrics["active_count"] += 1
 
         self.logger.info(f"Created new session: {session_id}")
         return session
@@ -83,15 +145,17 @@ class SessionManager:
             Session if found, None otherwise
         """
         # Check active sessions first
-        if session_id in self._active_sessions:
-            return self._active_sessions[session_id]
+        session = self._active_sessions.get(session_id)
+        if session is not None:
+            self._active_sessions.move_to_end(session_id)
+            return session
 
         # Try to load from disk
         session = await self._load_session(session_id)
         if session:
             # Add to active sessions if still valid
             if not self._is_session_expired(session):
-                self._active_sessions[session_id] = session
+                self._remember_session(session)
                 return session
             else:
                 self.logger.info(f"Session {session_id} has expired")
@@ -101,7 +165,7 @@ class SessionManager:
 
     async def update_session_progress(
         self, session_id: str, progress_update: ProgressUpdate
-    ) -> bool:
+    ) -> Optional[AppSession]:
         """
         Update session progress with agent progress information.
 
@@ -110,11 +174,11 @@ class SessionManager:
             progress_update: Progress update from agent
 
         Returns:
-            True if session was updated, False if session not found
+            The updated session, or None if session not found
         """
-        session = await self.get_session(session_id)
+        session = await self._get_active_or_load(session_id)
         if not session:
-            return False
+            return None
 
         # Update session progress
         session.update_progress(progress_update)
@@ -126,7 +190,7 @@ class SessionManager:
             f"Updated progress for session {session_id}: {
                           progress_update.progress_percentage}%"
         )
-        return True
+        return session
 
     async def complete_session(
         self, session_id: str, result: str, reasoning_chain: ReasoningChain
@@ -142,19 +206,21 @@ class SessionManager:
         Returns:
             True if session was completed, False if session not found
         """
-        session = await self.get_session(session_id)
+        session = await self._get_active_or_load(session_id)
         if not session:
             return False
 
         # Complete the session
+        was_active = session.status not in _FINAL_STATUSES
         session.complete_processing(result, reasoning_chain)
 
-        # Persist changes
+        # Persist changes; final states are written through immediately
         await self._persist_session(session)
+        await self.flush()
 
         # Update metrics
         self._session_metrics["total_completed"] += 1
-        if session_id in self._active_sessions:
+        if was_active and session_id in self._active_sessions:
             self._session_metrics["active_count"] -= 1
 
         self.logger.info(
@@ -174,19 +240,21 @@ class SessionManager:
         Returns:
             True if session was failed, False if session not found
         """
-        session = await self.get_session(session_id)
+        session = await self._get_active_or_load(session_id)
         if not session:
             return False
 
         # Fail the session
+        was_active = session.status not in _FINAL_STATUSES
         session.fail_processing(error)
 
-        # Persist changes
+        # Persist changes; final states are written through immediately
         await self._persist_session(session)
+        await self.flush()
 
         # Update metrics
         self._session_metrics["total_failed"] += 1
-        if session_id in self._active_sessions:
+        if was_active and session_id in self._active_sessions:
             self._session_metrics["active_count"] -= 1
 
         self.logger.error(f"Failed session {session_id}: {error}")
@@ -202,18 +270,20 @@ class SessionManager:
         Returns:
             True if session was cancelled, False if session not found
         """
-        session = await self.get_session(session_id)
+        session = await self._get_active_or_load(session_id)
         if not session:
             return False
 
         # Cancel the session
+        was_active = session.status not in _FINAL_STATUSES
         session.cancel_processing()
 
-        # Persist changes
+        # Persist changes; final states are written through immediately
         await self._persist_session(session)
+        await self.flush()
 
         # Update metrics
-        if session_id in self._active_sessions:
+        if was_active and session_id in self._active_sessions:
             self._session_metrics["active_count"] -= 1
 
         self.logger.info(f"Cancelled session {session_id}")
@@ -235,7 +305,7 @@ class SessionManager:
         self, limit: int = 50, status_filter: Optional[SessionStatus] = None
     ) -> List[AppSession]:
         """
-        Get session history from disk storage.
+        Get session history from storage, most recently updated first.
 
         Args:
             limit: Maximum number of sessions to return
@@ -244,32 +314,49 @@ class SessionManager:
         Returns:
             List of historical sessions
         """
-        sessions = []
+        return [
+            session
+            async for session in self.iter_session_history(limit, status_filter)
+        ]
 
-        try:
-            # Get all session files
-            session_files = list(self.storage_path.glob("*.json"))
-            session_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+    async def iter_session_history(
+        self, limit: int = 50, status_filter: Optional[SessionStatus] = None
+    ) -> AsyncIterator[AppSession]:
+        """
+        Iterate over session history, most recently updated first.
 
-            # Get more to account for filtering
-            for session_file in session_files[: limit * 2]:
-                try:
-                    session = await self._load_session_from_file(session_file)
-                    if session:
-                        if status_filter is None or session.status == status_filter:
-                            sessions.append(session)
-                            if len(sessions) >= limit:
-                                break
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to load session from {
-                                        session_file}: {e}"
-                    )
+        The bounded row set is fetched up front, so no cursor stays open
+        across yields, but sessions are parsed one at a time: a caller that
+        stops early never deserializes the rest.
+
+        Args:
+            limit: Maximum number of sessions to yield
+            status_filter: Optional status filter
+        """
+        if status_filter is None:
+            query = (
+                "SELECT id, payload FROM sessions ORDER BY updated_at DESC LIMIT ?",
+                (limit,),
+            )
+        else:
+            query = (
+                "SELECT id, payload FROM sessions WHERE status = ?"
+                " ORDER BY updated_at DESC LIMIT ?",
+                (status_filter.value, limit),
+            )
 
+        await self.flush()
+        try:
+            # A history page can be large; read it off the event loop
+            rows = await asyncio.to_thread(self._fetch, *query)
         except Exception as e:
             self.logger.error(f"Failed to get session history: {e}")
+            return
 
-        return sessions
+        for session_id, payload in rows:
+            session = self._parse_session(session_id, payload)
+            if session:
+                yield session
 
     async def delete_session(self, session_id: str) -> bool:
         """
@@ -282,61 +369,46 @@ class SessionManager:
             True if session was deleted, False if not found
         """
         # Remove from active sessions
-        if session_id in self._active_sessions:
-            del self._active_sessions[session_id]
-            self._session_metrics["active_count"] -= 1
+        self._forget_session(session_id)
 
-        # Remove from disk
-        session_file = self.storage_path / f"{session_id}.json"
-        if session_file.exists():
+        # Remove from storage, after any in-flight write that could re-add it
+        async with self._flush_lock:
+            self._pending.pop(session_id, None)
             try:
-                session_file.unlink()
-                self.logger.info(f"Deleted session {session_id}")
-                return True
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to delete session file {
-                                  session_file}: {e}"
+                deleted = await asyncio.to_thread(
+                    self._modify, "DELETE FROM sessions WHERE id = ?", (session_id,)
                 )
+            except Exception as e:
+                self.logger.error(f"Failed to delete session {session_id}: {e}")
+                return False
 
-        return False
+        if deleted:
+            self.logger.info(f"Deleted session {session_id}")
+        return bool(deleted)
 
     async def cleanup_old_sessions(self, older_than_days: int = 30) -> int:
         """
-        Clean up old session files.
+        Clean up old stored sessions.
 
         Args:
-            older_than_days: Delete sessions older than this many days
+            older_than_days: Delete sessions not updated for this many days
 
         Returns:
             Number of sessions cleaned up
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
+        cutoff = time.time() - timedelta(days=older_than_days).total_seconds()
         cleaned_count = 0
 
+        await self.flush()
         try:
-            session_files = list(self.storage_path.glob("*.json"))
-
-            for session_file in session_files:
-                try:
-                    # Check file modification time
-                    file_time = datetime.utcfromtimestamp(session_file.stat().st_mtime)
-
-                    if file_time < cutoff_date:
-                        session_file.unlink()
-                        cleaned_count += 1
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to process session file {
-                                        session_file}: {e}"
-                    )
-
+            cleaned_count = await asyncio.to_thread(
+                self._modify, "DELETE FROM sessions WHERE updated_at < ?", (cutoff,)
+            )
         except Exception as e:
             self.logger.error(f"Failed to cleanup old sessions: {e}")
 
         if cleaned_count > 0:
-            self.logger.info(f"Cleaned up {cleaned_count} old session files")
+            self.logger.info(f"Cleaned up {cleaned_count} old sessions")
 
         return cleaned_count
 
@@ -348,69 +420,207 @@ class SessionManager:
             "session_timeout_hours": self.session_timeout_hours,
         }
 
+    async def flush(self) -> None:
+        """Write every buffered session update to the database now."""
+        async with self._flush_lock:
+            rows = self._take_pending()
+            if rows:
+                await asyncio.to_thread(self._write_rows, rows)
+
+    async def close(self) -> None:
+        """Stop the background writer, flush pending updates and close the database."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        async with self._flush_lock:
+            rows = self._take_pending()
+            await asyncio.to_thread(self._write_rows, rows)
+            await asyncio.to_thread(self._close_db)
+
+    def _close_db(self) -> None:
+        # Waits for any read or write still running in a worker thread
+        with self._db_lock:
+            self._db.close()
+
+    @staticmethod
+    def _open_db(path: Path) -> sqlite3.Connection:
+        """Open the session database and make sure the schema exists."""
+        db = sqlite3.connect(path, check_same_thread=False)
+        for pragma in _PRAGMAS:
+            db.execute(pragma)
+        db.executescript(_SCHEMA)
+        return db
+
     async def _persist_session(self, session: AppSession) -> None:
-        """Persist a session to disk."""
-        session_file = self.storage_path / f"{session.session_id}.json"
+        """Queue a session for the next batched write."""
+        self._pending[session.session_id] = session
+        self._pending_event.set()
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Background writer; waits a short while so bursts share one commit."""
+        while True:
+            await self._pending_event.wait()
+            await asyncio.sleep(self.flush_interval_seconds)
+            self._pending_event.clear()
+            await self.flush()
+
+    def _take_pending(self) -> List[Tuple[str, str, float, str]]:
+        """
+        Serialize and clear the buffered sessions.
+
+        Runs on the event loop, since sessions keep changing while a write
+        is in progress.
+        """
+        if not self._pending:
+            return []
+
+        self._writing.update(self._pending)
+        sessions = list(self._pending.values())
+        self._pending.clear()
+        updated_at = time.time()
+
+        rows = []
+        for session in sessions:
+            try:
+                payload = session.model_dump_json(fallback=str)
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to persist session {session.session_id}: {e}"
+                )
+                continue
+            rows.append(
+                (session.session_id, session.status.value, updated_at, payload)
+            )
+        return rows
 
+    def _write_rows(self, rows: List[Tuple[str, str, float, str]]) -> None:
+        """Write serialized sessions in a single transaction."""
         try:
-            with open(session_file, "w") as f:
-                json.dump(session.model_dump(), f, indent=2, default=str)
+            if rows:
+                with self._db_lock, self._db:
+                    self._db.executemany(_UPSERT, rows)
         except Exception as e:
-            self.logger.error(
-                f"Failed to persist session {
-                              session.session_id}: {e}"
-            )
+            self.logger.error(f"Failed to persist {len(rows)} sessions: {e}")
+        finally:
+            for row in rows:
+                self._writing.pop(row[0], None)
+
+    def _fetch(self, sql: str, params: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        with self._db_lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _modify(self, sql: str, params: Tuple[Any, ...]) -> int:
+        with self._db_lock, self._db:
+            return self._db.execute(sql, params).rowcount
 
     async def _load_session(self, session_id: str) -> Optional[AppSession]:
-        """Load a session from disk."""
-        session_file = self.storage_path / f"{session_id}.json"
-        return await self._load_session_from_file(session_file)
+        """Load a session from storage."""
+        pending = self._pending.get(session_id) or self._writing.get(session_id)
+        if pending is not None:
+            return pending
 
-    async def _load_session_from_file(self, session_file: Path) -> Optional[AppSession]:
-        """Load a session from a specific file."""
-        if not session_file.exists():
+        try:
+            rows = await asyncio.to_thread(
+                self._fetch, "SELECT payload FROM sessions WHERE id = ?", (session_id,)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to load session {session_id}: {e}")
             return None
 
-        try:
-            with open(session_file, "r") as f:
-                session_data = json.load(f)
-
-            # Convert datetime strings back to datetime objects
-            for field in ["created_at", "started_at", "completed_at"]:
-                if session_data.get(field):
-                    session_data[field] = datetime.fromisoformat(
-                        session_data[field].replace("Z", "+00:00")
-                    )
+        if not rows:
+            return None
+        return self._parse_session(session_id, rows[0][0])
 
-            return AppSession(**session_data)
+    def _parse_session(self, session_id: str, payload: str) -> Optional[AppSession]:
+        """Rebuild a session from its stored payload."""
+        try:
+            # Datetimes are parsed by the validator itself
+            return AppSession.model_validate_json(payload)
 
         except Exception as e:
-            self.logger.error(
-                f"Failed to load session from {
-                              session_file}: {e}"
-            )
+            self.logger.error(f"Failed to load session {session_id}: {e}")
             return None
 
-    def _is_session_expired(self, session: AppSession) -> bool:
+    async def _get_active_or_load(self, session_id: str) -> Optional[AppSession]:
+        """
+        Get a session that is about to be modified.
+
+        Unlike get_session, a session loaded from storage is not checked for
+        expiry: a connection that outlived the timeout still records how it
+        ended.
+        """
+        session = self._active_sessions.get(session_id)
+        if session is not None:
+            self._active_sessions.move_to_end(session_id)
+            return session
+
+        session = await self._load_session(session_id)
+        if session is not None:
+            self._remember_session(session)
+        return session
+
+    def _remember_session(self, session: AppSession) -> None:
+        """Keep a session in memory, evicting the least recently used if full."""
+        if session.session_id not in self._active_sessions:
+            heapq.heappush(
+                self._expiry_heap, (self._expiry_at(session), session.session_id)
+            )
+            if session.status not in _FINAL_STATUSES:
+                self._session_metrics["active_count"] += 1
+        self._active_sessions[session.session_id] = session
+        self._active_sessions.move_to_end(session.session_id)
+
+        if len(self._active_sessions) <= self.max_active_sessions:
+            return
+
+        # Every change is already persisted (or queued in _pending), so an
+        # evicted session is simply reloaded on its next use. Sessions that
+        # are mid-query stay in memory.
+        for session_id, candidate in self._active_sessions.items():
+            if candidate.status is not SessionStatus.PROCESSING:
+                self._forget_session(session_id)
+                break
+
+    def _forget_session(self, session_id: str) -> None:
+        """Drop a session from memory, keeping active_count in step."""
+        session = self._active_sessions.pop(session_id, None)
+        # Finished sessions were already counted out when they ended
+        if session is not None and session.status not in _FINAL_STATUSES:
+            self._session_metrics["active_count"] -= 1
+
+    def _is_session_expired(
+        self, session: AppSession, now: Optional[datetime] = None
+    ) -> bool:
         """Check if a session has expired."""
         if not session.created_at:
             return False
 
-        expiry_time = session.created_at + timedelta(hours=self.session_timeout_hours)
-        return datetime.utcnow() > expiry_time
+        return (now or datetime.now(timezone.utc)) > self._expiry_at(session)
+
+    def _expiry_at(self, session: AppSession) -> datetime:
+        """A session's expiry time, filled in for sessions stored without one."""
+        if session.expiry_at is None:
+            session.expiry_at = session.created_at + self._session_timeout
+        return session.expiry_at
 
     async def _cleanup_session(self, session_id: str) -> None:
         """Clean up an expired session."""
-        if session_id in self._active_sessions:
-            del self._active_sessions[session_id]
-            self._session_metrics["active_count"] -= 1
+        self._forget_session(session_id)
 
     async def _cleanup_expired_sessions(self) -> None:
         """Clean up all expired sessions from active memory."""
         expired_sessions = []
+        now = datetime.now(timezone.utc)
+        heap = self._expiry_heap
 
-        for session_id, session in self._active_sessions.items():
-            if self._is_session_expired(session):
+        while heap and heap[0][0] < now:
+            _, session_id = heapq.heappop(heap)
+            session = self._active_sessions.get(session_id)
+            if session is not None and self._is_session_expired(session, now):
                 expired_sessions.append(session_id)
 
         for session_id in expired_sessions:
@@ -482,34 +692,34 @@ class SessionProgressTracker:
             agent_progress: Progress update from agent
         """
         # Update session in manager
-        updated = await self.session_manager.update_session_progress(
+        session = await self.session_manager.update_session_progress(
             session_id, agent_progress
         )
 
-        if updated and session_id in self._progress_callbacks:
-            # Get updated session
-            session = await self.session_manager.get_session(session_id)
-            if session:
-                # Create application progress
-                app_progress = AppProgress(
-                    session_id=session_id,
-                    status=session.status,
-                    progress_percentage=agent_progress.progress_percentage,
-                    current_step=agent_progress.current_task,
-                    agent_progress=agent_progress,
-                    elapsed_time_seconds=agent_progress.elapsed_time_seconds,
-                    details=agent_progress.details,
-                )
+        # Snapshot after the await: a callback may unregister itself
+        callbacks = tuple(self._progress_callbacks.get(session_id, ()))
+        if session and callbacks:
+            # Create application progress; the fields come straight from an
+            # already validated session and update
+            app_progress = AppProgress.model_construct(
+                session_id=session_id,
+                status=session.status,
+                progress_percentage=agent_progress.progress_percentage,
+                current_step=agent_progress.current_task,
+                agent_progress=agent_progress,
+                elapsed_time_seconds=agent_progress.elapsed_time_seconds,
+                details=agent_progress.details,
+            )
 
-                # Notify all callbacks
-                for callback in self._progress_callbacks[session_id]:
-                    try:
-                        callback(app_progress)
-                    except Exception as e:
-                        self.logger.error(
-                            f"Progress callback failed for session {
-                                          session_id}: {e}"
-                        )
+            # Notify all callbacks
+            for callback in callbacks:
+                try:
+                    callback(app_progress)
+                except Exception as e:
+                    self.logger.error(
+                        f"Progress callback failed for session {
+                                      session_id}: {e}"
+                    )
 
     def cleanup_session_callbacks(self, session_id: str) -> None:
         """
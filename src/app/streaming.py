@@ -1,21 +1,34 @@
-import json
 import logging
+import weakref
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from agent.models import ProgressUpdate
+import msgspec
+import orjson
+
+from agent.models import ProgressUpdate, to_builtins
 from agent.tasks import ReasoningChain, TaskStatus
 
 from .coordinator import AppCoordinator
-from .models import AppProgress, ToolExecutionRequest
+from .models import AppProgress, SessionStatus, ToolExecutionRequest
 from .session import AppSession
 
+# Reported for progress that arrives after its session has been dropped; the
+# status a fresh AppSession would have
+_DEFAULT_STATUS = SessionStatus.INITIALIZING
+
+# Wire formats a client can pick with the set_wire_format command
+_WIRE_FORMATS = ("json", "msgpack")
+
 
 def safe_json_serialize(obj):
     """Custom JSON serializer that handles datetime objects and Pydantic models."""
     try:
         if isinstance(obj, datetime):
             return obj.isoformat()
+        # Handle msgspec structs (ProgressUpdate, ToolCall, ...)
+        if isinstance(obj, msgspec.Struct):
+            return to_builtins(obj)
         # Handle Pydantic BaseModel instances
         if hasattr(obj, 'model_dump'):
             return obj.model_dump(mode='json')
@@ -46,6 +59,11 @@ class AppStreamingHandler:
         # Active streaming sessions
         self.active_sessions: Dict[str, AppSession] = {}
 
+        # Connections that asked for binary MessagePack frames instead of
+        # JSON text; entries go away with the connection
+        self._msgpack_clients: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=safe_json_serialize)
+
     async def handle_agent_query(
         self, websocket, session_id: str, query_data: Dict[str, Any]
     ) -> None:
@@ -93,6 +111,7 @@ class AppStreamingHandler:
                 user_query=user_query,
                 context=context,
                 progress_callback=progress_callback,
+                session_id=session_id,
             )
 
             # Update session and send final result
@@ -125,7 +144,7 @@ class AppStreamingHandler:
         finally:
             # Keep session for history but mark as inactive
             if session_id in self.active_sessions:
-                self.active_sessions[session_id].metadata["websocket_closed"] = True
+                self.active_sessions[session_id].metadata.websocket_closed = True
 
     async def send_agent_workflow_started(
         self,
@@ -294,18 +313,37 @@ class AppStreamingHandler:
     async def handle_get_available_tools(self, websocket, session_id: str) -> None:
         """Handle request for available tools."""
         try:
-            tools = await self.app_coordinator.get_available_tools()
+            # The tool list is cached as JSON bytes; splice it into the frame
+            # instead of rebuilding and re-serializing the dicts every time
+            tools_json, total_count = (
+                await self.app_coordinator.get_available_tools_json()
+            )
+            if websocket in self._msgpack_clients:
+                await self._send_message(
+                    websocket,
+                    {
+                        "type": "available_tools",
+                        "session_id": session_id,
+                        "tools": orjson.loads(tools_json),
+                        "total_count": total_count,
+                    },
+                )
+                return
 
-            await self._send_message(
-                websocket,
-                {
-                    "type": "available_tools",
-                    "session_id": session_id,
-                    "tools": tools,
-                    "total_count": len(tools),
-                },
+            frame = b"".join(
+                (
+                    b'{"type":"available_tools","session_id":',
+                    orjson.dumps(session_id),
+                    b',"tools":',
+                    tools_json,
+                    b',"total_count":',
+                    str(total_count).encode(),
+                    b"}",
+                )
             )
 
+            await websocket.send_text(frame.decode())
+
         except Exception as e:
             error_msg = str(e)
             self.logger.error(
@@ -332,10 +370,33 @@ class AppStreamingHandler:
             )
             await self._send_error(websocket, error_msg, session_id)
 
+    async def handle_set_wire_format(
+        self, websocket, session_id: str, wire_format: str
+    ) -> None:
+        """
+        Switch the frames sent to this connection between JSON text and
+        binary MessagePack. The acknowledgement is sent in the new format.
+        """
+        if wire_format not in _WIRE_FORMATS:
+            await self._send_error(
+                websocket, f"Unsupported wire format: {wire_format}", session_id
+            )
+            return
+
+        if wire_format == "msgpack":
+            self._msgpack_clients.add(websocket)
+        else:
+            self._msgpack_clients.discard(websocket)
+
+        await self._send_message(
+            websocket,
+            {"type": "wire_format", "session_id": session_id, "format": wire_format},
+        )
+
     async def handle_cancel_workflow(self, websocket, session_id: str) -> None:
         """Handle workflow cancellation request."""
         try:
-            cancelled = await self.app_coordinator.cancel_current_workflow()
+            cancelled = await self.app_coordinator.cancel_current_workflow(session_id)
 
             await self._send_message(
                 websocket,
@@ -364,17 +425,17 @@ class AppStreamingHandler:
         """Send a progress update to the WebSocket client."""
         try:
             # Update session progress if it exists
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id].update_progress(update)
+            session = self.active_sessions.get(session_id)
+            if session is not None:
+                session.update_progress(update)
+                status = session.status
+            else:
+                status = _DEFAULT_STATUS
 
             # Create application-level progress
-            session = self.active_sessions.get(
-                session_id, AppSession(session_id=session_id)
-            )
-            
             app_progress = AppProgress(
                 session_id=session_id,
-                status=session.status,
+                status=status,
                 progress_percentage=update.progress_percentage,
                 current_step=update.current_task,
                 agent_progress=update,
@@ -382,20 +443,6 @@ class AppStreamingHandler:
                 details=update.details,
             )
 
-            # Send enhanced agent progress with agent context
-            try:
-                # Safely serialize app_progress with JSON mode for proper enum handling
-                details = app_progress.model_dump(mode='json')
-            except Exception as e:
-                self.logger.warning(f"Failed to serialize app_progress: {e}")
-                details = {
-                    "session_id": session_id,
-                    "status": session.status.value if hasattr(session.status, 'value') else str(session.status),
-                    "progress_percentage": update.progress_percentage,
-                    "current_step": update.current_task,
-                    "elapsed_time_seconds": update.elapsed_time_seconds,
-                }
-
             message = {
                 "type": "agent_progress",
                 "session_id": session_id,
@@ -406,10 +453,28 @@ class AppStreamingHandler:
                 ) if update.agent_type else None,
                 "progress": update.progress_percentage,
                 "message": update.current_task,
-                "details": details,
             }
 
-            await self._send_message(websocket, message)
+            # Send enhanced agent progress with agent context. pydantic-core
+            # encodes the details to JSON in one pass and they are spliced
+            # into the frame, rather than dumped to a dict and walked again.
+            try:
+                details_json = app_progress.model_dump_json().encode()
+            except Exception as e:
+                self.logger.warning(f"Failed to serialize app_progress: {e}")
+                message["details"] = {
+                    "session_id": session_id,
+                    "status": status.value,
+                    "progress_percentage": update.progress_percentage,
+                    "current_step": update.current_task,
+                    "elapsed_time_seconds": update.elapsed_time_seconds,
+                }
+                await self._send_message(websocket, message)
+                return
+
+            await self._send_spliced(
+                websocket, message, "details", app_progress, details_json
+            )
             
         except Exception as e:
             self.logger.warning(f"Failed to send progress update: {e}")
@@ -467,15 +532,54 @@ class AppStreamingHandler:
             if not isinstance(message, dict):
                 self.logger.error(f"Message must be a dictionary, got {type(message)}: {message}")
                 return
-                
-            json_message = json.dumps(message, default=safe_json_serialize)
-            await websocket.send_text(json_message)
+
+            if websocket in self._msgpack_clients:
+                await websocket.send_bytes(self._msgpack_encoder.encode(message))
+                return
+
+            # orjson handles datetimes, enums and dataclasses natively; the
+            # default hook only sees Pydantic models and msgspec structs
+            json_message = orjson.dumps(
+                message, default=safe_json_serialize, option=orjson.OPT_NON_STR_KEYS
+            )
+            await websocket.send_text(json_message.decode())
         except Exception as e:
             self.logger.warning(f"Failed to send WebSocket message: {e}")
             self.logger.debug(f"Failed message content: {message}")
             self.logger.debug(f"WebSocket object: {websocket}")
             self.logger.debug(f"WebSocket type: {type(websocket)}")
 
+    async def _send_spliced(
+        self,
+        websocket,
+        envelope: Dict[str, Any],
+        field: str,
+        value: Any,
+        value_json: bytes,
+    ) -> None:
+        """
+        Send ``envelope`` plus one more field whose JSON encoding is already
+        known, so JSON clients get it without re-serializing ``value``.
+        """
+        if websocket in self._msgpack_clients:
+            await self._send_message(websocket, {**envelope, field: value})
+            return
+
+        try:
+            frame = b"".join(
+                (
+                    orjson.dumps(envelope, default=safe_json_serialize)[:-1],
+                    b',"',
+                    field.encode(),
+                    b'":',
+                    value_json,
+                    b"}",
+                )
+            )
+            await websocket.send_text(frame.decode())
+        except Exception as e:
+            self.logger.warning(f"Failed to send WebSocket message: {e}")
+
     def get_active_sessions(self) -> Dict[str, Dict[str, Any]]:
         """Get information about active sessions."""
         return {
@@ -486,5 +590,5 @@ class AppStreamingHandler:
                 "progress": session.progress_percentage,
             }
             for session_id, session in self.active_sessions.items()
-            if not session.metadata.get("websocket_closed", False)
+            if not session.metadata.websocket_closed
         }
@@ -2,9 +2,10 @@ import asyncio
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import logfire
+import orjson
 
 from agent.models import AgentType, ToolCall
 from agent.tasks import Task
@@ -25,6 +26,16 @@ class AvailableToolInfo:
     server_type: str  # filesystem, git, codebase, devtools, exa, langchain
     _adapter: UnifiedTool  # Internal adapter reference for accessing tool
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Public fields for JSON responses."""
+        return {
+            "name": self.name,
+            "server_id": self.server_id,
+            "description": self.description,
+            "parameters": self.parameters,
+            "server_type": self.server_type,
+        }
+
 
 class ToolBridge:
     """
@@ -40,6 +51,8 @@ class ToolBridge:
         self._tool_cache: Dict[str, AvailableToolInfo] = {}
         self._last_cache_update: float = 0
         self._cache_ttl_seconds: float = 300  # 5 minutes
+        # (cache timestamp, serialized tool list, tool count)
+        self._tools_json: Optional[Tuple[float, bytes, int]] = None
 
     async def get_available_tools(
         self, refresh_cache: bool = False
@@ -126,6 +139,24 @@ class ToolBridge:
 
         return tools_info
 
+    async def get_available_tools_json(self) -> Tuple[bytes, int]:
+        """
+        Get the available tools pre-serialized as a JSON array.
+
+        The bytes are re-encoded only when the tool cache is refreshed, so
+        repeated tool listings skip building and serializing dicts.
+
+        Returns:
+            Tuple of (JSON array bytes, number of tools)
+        """
+        tools = await self.get_available_tools()
+
+        if self._tools_json is None or self._tools_json[0] != self._last_cache_update:
+            payload = orjson.dumps([tool.to_dict() for tool in tools])
+            self._tools_json = (self._last_cache_update, payload, len(tools))
+
+        return self._tools_json[1], self._tools_json[2]
+
     def _extract_tool_parameters(self, adapter: UnifiedTool) -> Dict[str, Any]:
         """Extract parameter schema from unified tool adapter."""
         try:
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from pydantic import Field
@@ -90,6 +91,7 @@ class Settings(BaseSettings):
             raise ValueError(f"Unsupported ENGINE_TYPE: {self.engine_type}")
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Instantiate and return the Settings object."""
+    """Return the process-wide Settings, parsed from the environment once."""
     return Settings()
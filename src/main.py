@@ -6,6 +6,12 @@ from pathlib import Path
 
 import logfire
 
+try:
+    # Installed with uvicorn[standard] on platforms that support it
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from config import Settings, get_settings
 from server import BrainServer, WSSettings
 
@@ -69,6 +75,13 @@ def setup_logging(settings: Settings) -> logging.Logger:
 
 
 async def main() -> None:
+    # Coroutines that finish without suspending (cache hits, no-op checks)
+    # complete eagerly instead of allocating and scheduling a Task. The
+    # eager factory only exists on Python 3.12+; older versions keep the
+    # default scheduling.
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     validate_paths()
 
     settings = get_settings()
@@ -95,6 +108,11 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # uvicorn only picks its loop when it creates one; the server runs
+        # inside this loop, so choose uvloop here
+        if uvloop:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         pass
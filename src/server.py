@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 import logfire
+import orjson
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
@@ -131,8 +132,9 @@ class BrainServer:
             # Check if websocket is still open
             if hasattr(websocket, "client_state") and websocket.client_state.value >= 2:
                 return False
-            # Use custom JSON serializer to handle datetime objects
-            await websocket.send_text(json.dumps(message, default=safe_json_serialize))
+            await websocket.send_text(
+                orjson.dumps(message, default=safe_json_serialize).decode()
+            )
             return True
         except Exception as e:
             if self.logger.isEnabledFor(logging.DEBUG):
@@ -182,7 +184,9 @@ class BrainServer:
                 try:
                     # Receive message from WebSocket
                     message = await websocket.receive_text()
-                    data = json.loads(message)
+                    # orjson.JSONDecodeError subclasses json.JSONDecodeError,
+                    # so malformed frames still get the error reply below
+                    data = orjson.loads(message)
 
                     # Ensure session ID is included
                     data["session_id"] = session_id
@@ -458,6 +462,9 @@ class BrainServer:
             servers_info = await self.mcp_client.get_all_servers()
             message = {"type": "servers_update", "servers": servers_info}
 
+            # Serialize once for every client
+            payload = orjson.dumps(message, default=safe_json_serialize).decode()
+
             # Send to all clients
             failed_clients = []
             for session_id, client in self.connected_clients.items():
@@ -470,7 +477,7 @@ class BrainServer:
                         # Connection is closing or closed
                         failed_clients.append(session_id)
                         continue
-                    await client.send_text(json.dumps(message, default=safe_json_serialize))
+                    await client.send_text(payload)
                 except Exception as e:
                     self.logger.warning(f"Error sending to client {session_id}: {e}")
                     failed_clients.append(session_id)
@@ -590,6 +597,7 @@ class BrainServer:
 
             # Shutdown app coordinator
             await self.app_coordinator.shutdown()
+            await self.session_manager.close()
 
             self.logger.info("Brain server shutdown completed")
         except Exception as e:
@@ -4,9 +4,9 @@ import re
 import sys
 import time
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Callable, Dict, List, Optional, Union
 
-import tiktoken
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.tools import load_mcp_tools
 from mcp.types import Tool
@@ -41,17 +41,6 @@ class MCPClient:
         self._multi_server_client: Optional[MultiServerMCPClient] = None
         self.servers_config: Dict[str, Any] = {}
 
-        try:
-            # TODO
-            # should know what model is being used for the query
-            # being processed and use that to infer the encoding
-            self.token_encoder = tiktoken.encoding_for_model("gpt-4")
-        except Exception as e:
-            self.logger.warning(
-                f"Failed to load tiktoken encoder, using cl100k_base: {e}"
-            )
-            self.token_encoder = tiktoken.get_encoding("cl100k_base")
-
         self.query_metrics: List[QueryMetrics] = []
         self.logger.info("MCPClient instance created.")
 
@@ -87,6 +76,23 @@ class MCPClient:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(current_dir, "servers", server_file)
 
+    @cached_property
+    def token_encoder(self) -> Any:
+        # Loaded on first use: building the BPE tables (or fetching them on
+        # a fresh machine) would otherwise delay every server start
+        import tiktoken
+
+        try:
+            # TODO
+            # should know what model is being used for the query
+            # being processed and use that to infer the encoding
+            return tiktoken.encoding_for_model("gpt-4")
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to load tiktoken encoder, using cl100k_base: {e}"
+            )
+            return tiktoken.get_encoding("cl100k_base")
+
     def _count_tokens(self, text: str) -> int:
         try:
             return len(self.token_encoder.encode(text))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The application packages (agent, app, tools) live directly under src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,124 @@
+from agent.answer_cache import AnswerCache
+from agent.models import AgentResult, AgentType, ToolCall
+from agent.tasks import ReasoningChain, ReasoningStep, TaskList
+
+READ_ONLY = ("read_file", "list_directory", "search")
+
+
+def make_chain(*tool_names, step_tools=()):
+    """A completed chain whose execution step ran the given tools."""
+    execution_results = [
+        AgentResult(
+            agent_type=AgentType.EXECUTION,
+            success=True,
+            output="ok",
+            execution_time_seconds=0,
+            tool_calls=[{"tool_name": name}],
+        )
+        for name in tool_names
+    ]
+    chain = ReasoningChain(original_query="q", task_list=TaskList(name="t"))
+    chain.start_chain()
+    chain.add_reasoning_step(
+        ReasoningStep(
+            step_number=3,
+            title="Execution Step",
+            agent_type=AgentType.EXECUTION,
+            description="Execute tool plans",
+            output_data={"execution_results": execution_results},
+            tool_calls=tuple(ToolCall(tool_name=name) for name in step_tools),
+        )
+    )
+    chain.complete_chain("the answer")
+    return chain
+
+
+def make_cache(**kwargs):
+    kwargs.setdefault("read_only_tools", READ_ONLY)
+    return AnswerCache(**kwargs)
+
+
+def expire(cache):
+    for entry in cache._entries.values():
+        entry.stored_at -= cache.ttl_seconds + 1
+
+
+def test_read_only_chain_is_cached():
+    cache = make_cache()
+    cache.store("what is in README?", {}, make_chain("read_file", "search"))
+
+    assert cache.lookup("  what is in   README?", {}) is not None
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_chain_with_write_tool_is_not_cached():
+    cache = make_cache()
+    cache.store("update README", {}, make_chain("read_file", "write_file"))
+    cache.store("fix it", {}, make_chain("read_file", step_tools=("write_file",)))
+
+    assert cache.lookup("update README", {}) is None
+    assert cache.lookup("fix it", {}) is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_unfinished_chain_is_not_cached():
+    cache = make_cache()
+    chain = make_chain("read_file")
+    chain.fail_chain("boom")
+    cache.store("q", {}, chain)
+
+    assert cache.lookup("q", {}) is None
+
+
+def test_context_is_part_of_the_key():
+    cache = make_cache()
+    cache.store("q", {"cwd": "/a"}, make_chain("read_file"))
+
+    assert cache.lookup("q", {"cwd": "/b"}) is None
+    assert cache.lookup("q", {"cwd": "/a"}) is not None
+
+
+def test_expired_entry_is_dropped():
+    cache = make_cache(ttl_seconds=60.0)
+    cache.store("q", {}, make_chain("read_file"))
+    expire(cache)
+
+    assert cache.lookup("q", {}) is None
+    assert cache.get_stats() == {
+        "entries": 0,
+        "hits": 0,
+        "misses": 1,
+        "hit_rate": 0.0,
+    }
+
+
+def test_least_frequently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.store("hot", {}, make_chain("read_file"))
+    cache.store("cold", {}, make_chain("read_file"))
+    cache.lookup("hot", {})
+    cache.lookup("hot", {})
+
+    cache.store("new", {}, make_chain("read_file"))
+
+    assert cache.lookup("cold", {}) is None
+    assert cache.lookup("hot", {}) is not None
+    assert cache.lookup("new", {}) is not None
+
+
+def test_hit_returns_deep_copy_with_new_id():
+    cache = make_cache()
+    original = make_chain("read_file")
+    cache.store("q", {}, original)
+
+    first = cache.lookup("q", {})
+    first.reasoning_steps[0].output_data["execution_results"].clear()
+    first.final_result = "changed"
+    second = cache.lookup("q", {})
+
+    assert len({original.id, first.id, second.id}) == 3
+    assert second.final_result == "the answer"
+    assert len(second.reasoning_steps[0].output_data["execution_results"]) == 1
+    # Changing the stored chain's source after store() does not leak in either
+    original.final_result = "mutated"
+    assert cache.lookup("q", {}).final_result == "the answer"
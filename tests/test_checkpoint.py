@@ -0,0 +1,156 @@
+import asyncio
+
+from agent.checkpoint import ChainCheckpointer
+from agent.models import AgentConfig, AgentResult, AgentType
+from agent.tasks import ReasoningChain, Task, TaskList, TaskStatus
+from agent.workflow import WorkflowExecutor
+
+
+def run(coro_fn):
+    """Run an async test body; the dev requirements have no asyncio plugin."""
+    return asyncio.run(coro_fn())
+
+
+def make_chain():
+    """A chain interrupted after its first task, with one task mid-run."""
+    task_list = TaskList(name="plan")
+    task_list.bulk_add_tasks(
+        [
+            Task(id="fetch", title="fetch", description="fetch the data"),
+            Task(
+                id="parse",
+                title="parse",
+                description="parse the data",
+                dependencies=("fetch",),
+            ),
+            Task(
+                id="report",
+                title="report",
+                description="write the report",
+                dependencies=("parse",),
+            ),
+        ]
+    )
+    chain = ReasoningChain(original_query="summarize the data", task_list=task_list)
+    chain.start_chain()
+
+    fetch = task_list.pop_next_ready()
+    fetch.start_execution()
+    fetch.complete_execution("fetched 3 rows")
+    task_list.mark_task_completed(fetch.id)
+    task_list.pop_next_ready().start_execution()
+    return chain
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.task_ids = []
+
+    async def execute_with_progress(self, input_data, context, progress_callback):
+        task_list = input_data["task_list"]
+        self.task_ids = [task.id for task in task_list.scheduled_tasks()]
+        results = [
+            AgentResult(
+                agent_type=AgentType.ORCHESTRATOR,
+                success=True,
+                output=f"plan for {task_id}",
+                execution_time_seconds=0,
+                metadata={"task_id": task_id},
+            )
+            for task_id in self.task_ids
+        ]
+        return AgentResult(
+            agent_type=AgentType.ORCHESTRATOR,
+            success=True,
+            output={"task_list_id": task_list.id, "orchestration_results": results},
+            execution_time_seconds=0,
+        )
+
+
+class FakeExecutor:
+    max_concurrency = 4
+
+    def __init__(self):
+        self.plans = []
+
+    async def execute_with_progress(self, input_data, context, progress_callback):
+        self.plans.append(input_data["execution_plan"])
+        return AgentResult(
+            agent_type=AgentType.EXECUTION,
+            success=True,
+            output=f"ran {input_data['execution_plan']}",
+            execution_time_seconds=0,
+        )
+
+
+def make_executor(checkpointer):
+    configs = [
+        AgentConfig(agent_type=agent_type, model="test")
+        for agent_type in (
+            AgentType.PLANNING,
+            AgentType.ORCHESTRATOR,
+            AgentType.EXECUTION,
+        )
+    ]
+    executor = WorkflowExecutor(None, *configs, checkpointer=checkpointer)
+    orchestrator, execution = FakeOrchestrator(), FakeExecutor()
+    executor.orchestrator_agent.execute_with_progress = (
+        orchestrator.execute_with_progress
+    )
+    executor.execution_agent.execute_with_progress = execution.execute_with_progress
+    return executor, orchestrator, execution
+
+
+async def ignore_progress(update):
+    pass
+
+
+def test_save_and_load_unfinished(tmp_path):
+    async def body():
+        checkpointer = ChainCheckpointer(tmp_path)
+        chain = make_chain()
+        await checkpointer.save(chain)
+
+        finished = ReasoningChain(original_query="done", task_list=TaskList(name="t"))
+        finished.complete_chain("answer")
+        await checkpointer.save(finished)
+
+        return chain, await checkpointer.load_unfinished()
+
+    chain, loaded = run(body)
+    assert [restored.id for restored in loaded] == [chain.id]
+    task_list = loaded[0].task_list
+    assert task_list.is_task_completed("fetch")
+    assert task_list.get_task("fetch").result == "fetched 3 rows"
+    assert task_list.get_task("parse").status == TaskStatus.IN_PROGRESS
+
+
+def test_resume_runs_only_pending_tasks(tmp_path):
+    async def body():
+        checkpointer = ChainCheckpointer(tmp_path)
+        await checkpointer.save(make_chain())
+        (resumed,) = await checkpointer.load_unfinished()
+
+        executor, orchestrator, execution = make_executor(checkpointer)
+        chain = await executor.execute_query(
+            resumed.original_query, ignore_progress, resume_from=resumed
+        )
+        return chain, orchestrator.task_ids, execution.plans, checkpointer
+
+    chain, orchestrated, plans, checkpointer = run(body)
+
+    assert chain.status == TaskStatus.COMPLETED
+    assert orchestrated == ["parse", "report"]
+    assert plans == ["plan for parse", "plan for report"]
+    task_list = chain.task_list
+    assert task_list.completed_task_ids == ["fetch", "parse", "report"]
+    assert task_list.get_task("fetch").result == "fetched 3 rows"
+    assert task_list.get_task("report").result == "ran plan for report"
+    # The chain's own indexes still cover every task
+    assert [task.id for task in task_list.scheduled_tasks()] == [
+        "fetch",
+        "parse",
+        "report",
+    ]
+    # Completed chains leave no checkpoint behind
+    assert run(checkpointer.load_unfinished) == []
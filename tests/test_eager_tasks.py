@@ -0,0 +1,118 @@
+import asyncio
+import logging
+
+import pytest
+
+from agent.models import AgentType, ProgressUpdate
+from agent.tasks import ReasoningChain, TaskList
+from agent.workflow import _ProgressCoalescer
+from app.coordinator import AppCoordinator, SystemMetrics
+from app.session import SessionManager
+
+# main() installs the eager task factory when the interpreter has it; code
+# that spawns tasks must behave the same under either factory
+FACTORIES = [
+    pytest.param(False, id="default"),
+    pytest.param(
+        True,
+        id="eager",
+        marks=pytest.mark.skipif(
+            not hasattr(asyncio, "eager_task_factory"),
+            reason="eager task factory needs Python 3.12+",
+        ),
+    ),
+]
+
+
+def run(coro_fn, eager):
+    async def main():
+        if eager:
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        return await coro_fn()
+
+    return asyncio.run(main())
+
+
+def progress(status, percentage):
+    return ProgressUpdate(
+        agent_type=AgentType.EXECUTION,
+        status=status,
+        progress_percentage=percentage,
+        elapsed_time_seconds=0.0,
+    )
+
+
+@pytest.mark.parametrize("eager", FACTORIES)
+def test_progress_coalescer_flushes_on_close(eager):
+    async def body():
+        received = []
+
+        async def callback(update):
+            received.append((update.status, update.progress_percentage))
+
+        coalescer = _ProgressCoalescer(callback, logging.getLogger("test"))
+        await coalescer.send(progress("running", 10.0))
+        await coalescer.send(progress("running", 20.0))
+        await coalescer.send(progress("completed", 100.0))
+        await coalescer.aclose()
+        return received
+
+    received = run(body, eager)
+    assert received[-1] == ("completed", 100.0)
+    assert ("running", 20.0) in received
+
+
+@pytest.mark.parametrize("eager", FACTORIES)
+def test_session_flush_loop_writes_pending(eager, tmp_path):
+    async def body():
+        manager = SessionManager(storage_path=tmp_path, flush_interval_seconds=0.01)
+        session = await manager.create_session({})
+        await asyncio.sleep(0.1)
+        rows = manager._fetch("SELECT id FROM sessions", ())
+        await manager.close()
+        return session.session_id, rows
+
+    session_id, rows = run(body, eager)
+    assert rows == [(session_id,)]
+
+
+class SlowEngine:
+    def __init__(self):
+        self.calls = 0
+
+    async def process_query(self, user_query, context, progress_callback, **kwargs):
+        self.calls += 1
+        await progress_callback(progress("running", 50.0))
+        await asyncio.sleep(0.01)
+        return ReasoningChain(original_query=user_query, task_list=TaskList(name="t"))
+
+
+@pytest.mark.parametrize("eager", FACTORIES)
+def test_identical_queries_share_one_workflow(eager):
+    async def body():
+        coordinator = AppCoordinator.__new__(AppCoordinator)
+        coordinator.agent_engine = SlowEngine()
+        coordinator.logger = logging.getLogger("test")
+        coordinator._initialized = True
+        coordinator._inflight = {}
+        coordinator._session_workflows = {}
+        coordinator._system_metrics = SystemMetrics()
+
+        async def callback(update):
+            pass
+
+        chains = await asyncio.gather(
+            *(
+                asyncio.create_task(
+                    coordinator.process_query("q", {}, callback, session_id=str(i))
+                )
+                for i in range(3)
+            )
+        )
+        return coordinator, chains
+
+    coordinator, chains = run(body, eager)
+    assert coordinator.agent_engine.calls == 1
+    assert len({id(chain) for chain in chains}) == 3
+    assert not coordinator._inflight
+    assert not coordinator._session_workflows
@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+
+from agent.llm_pool import LLMEndpoint, LLMPool
+
+
+class FakeAgent:
+    """Stands in for a pydantic-ai Agent; fails for models in ``failing``."""
+
+    def __init__(self, failing=(), error=None):
+        self.failing = set(failing)
+        self.error = error or httpx.ConnectError("connection refused")
+        self.calls = []
+        self.release = None
+
+    async def run(self, prompt, model, **kwargs):
+        self.calls.append(model)
+        if self.release is not None:
+            await self.release.wait()
+        if model in self.failing:
+            raise self.error
+        return f"{model}: {prompt}"
+
+
+def make_pool(*names, failure_threshold=2):
+    pool = LLMPool(
+        [
+            LLMEndpoint(provider="test", model=name, priority=i)
+            for i, name in enumerate(names)
+        ],
+        failure_threshold=failure_threshold,
+        reset_timeout_seconds=30.0,
+    )
+    # Skip provider resolution; the fake agent only needs a name
+    pool._model_for = lambda endpoint: endpoint.model
+    return pool
+
+
+def expire_circuit(pool, endpoint):
+    endpoint.circuit_opened_at -= pool.reset_timeout_seconds
+
+
+def run(coro_fn):
+    """Run an async test body; the dev requirements have no asyncio plugin."""
+    return asyncio.run(coro_fn())
+
+
+def test_fails_over_and_opens_circuit():
+    async def body():
+        pool = make_pool("primary", "backup")
+        primary = pool.endpoints[0]
+        agent = FakeAgent(failing={"primary"})
+
+        assert await pool.run(agent, "hi") == "backup: hi"
+        assert primary.circuit_opened_at is None
+
+        await pool.run(agent, "hi")
+        assert primary.circuit_opened_at is not None
+
+        agent.calls.clear()
+        await pool.run(agent, "hi")
+        assert agent.calls == ["backup"]
+
+    run(body)
+
+
+def test_half_open_admits_a_single_probe():
+    async def body():
+        pool = make_pool("primary", "backup")
+        primary = pool.endpoints[0]
+        agent = FakeAgent(failing={"primary"})
+        for _ in range(2):
+            await pool.run(agent, "hi")
+        expire_circuit(pool, primary)
+
+        agent.failing.clear()
+        agent.calls.clear()
+        agent.release = asyncio.Event()
+        runs = [asyncio.create_task(pool.run(agent, "hi")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        assert agent.calls.count("primary") == 1
+        assert primary.half_open
+
+        agent.release.set()
+        await asyncio.gather(*runs)
+        assert not primary.half_open
+        assert primary.circuit_opened_at is None
+        assert primary.consecutive_failures == 0
+
+    run(body)
+
+
+def test_failed_probe_reopens_circuit():
+    async def body():
+        pool = make_pool("primary", "backup")
+        primary = pool.endpoints[0]
+        agent = FakeAgent(failing={"primary"})
+        for _ in range(2):
+            await pool.run(agent, "hi")
+        expire_circuit(pool, primary)
+        expired_at = primary.circuit_opened_at
+
+        assert await pool.run(agent, "hi") == "backup: hi"
+        assert not primary.half_open
+        assert primary.circuit_opened_at > expired_at
+
+        agent.calls.clear()
+        await pool.run(agent, "hi")
+        assert agent.calls == ["backup"]
+
+    run(body)
+
+
+def test_non_transport_errors_do_not_fail_over():
+    async def body():
+        pool = make_pool("primary", "backup")
+        agent = FakeAgent(failing={"primary"}, error=ValueError("bad output"))
+
+        with pytest.raises(ValueError):
+            await pool.run(agent, "hi")
+        assert agent.calls == ["primary"]
+        assert pool.endpoints[0].consecutive_failures == 0
+
+    run(body)
+
+
+def test_all_endpoints_failing():
+    async def body():
+        pool = make_pool("primary", failure_threshold=1)
+        agent = FakeAgent(failing={"primary"})
+
+        with pytest.raises(RuntimeError, match="failed"):
+            await pool.run(agent, "hi")
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await pool.run(agent, "hi")
+
+    run(body)
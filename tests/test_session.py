@@ -0,0 +1,183 @@
+import asyncio
+
+from agent.models import AgentType, ProgressUpdate
+from agent.tasks import ReasoningChain, TaskList
+from app.models import SessionStatus
+from app.session import SessionManager
+
+# Long enough that the background writer never fires during a test, so only
+# explicit flushes and write-through states reach the database
+NO_AUTO_FLUSH = 60.0
+
+
+def run(coro_fn):
+    """Run an async test body; the dev requirements have no asyncio plugin."""
+    return asyncio.run(coro_fn())
+
+
+def make_manager(path, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", NO_AUTO_FLUSH)
+    return SessionManager(storage_path=path, **kwargs)
+
+
+def stored(manager):
+    """Stored sessions as {session_id: status}."""
+    return dict(manager._fetch("SELECT id, status FROM sessions", ()))
+
+
+def progress(percentage):
+    return ProgressUpdate(
+        agent_type=AgentType.EXECUTION,
+        status="running",
+        progress_percentage=percentage,
+        elapsed_time_seconds=1.0,
+    )
+
+
+def test_flushed_session_reloads_after_eviction(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path)
+        session = await manager.create_session({"user": "alice"})
+        await manager.update_session_progress(session.session_id, progress(40.0))
+        assert stored(manager) == {}
+
+        await manager.flush()
+        assert stored(manager) == {session.session_id: "ready"}
+
+        manager._forget_session(session.session_id)
+        assert session.session_id not in manager._active_sessions
+
+        reloaded = await manager.get_session(session.session_id)
+        assert reloaded is not session
+        assert reloaded.metadata.extras == {"user": "alice"}
+        assert reloaded.progress_percentage == 40.0
+        assert session.session_id in manager._active_sessions
+        await manager.close()
+
+    run(body)
+
+
+def test_final_states_written_through(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path)
+        completed = await manager.create_session({})
+        failed = await manager.create_session({})
+        cancelled = await manager.create_session({})
+        chain = ReasoningChain(original_query="q", task_list=TaskList(name="t"))
+
+        await manager.complete_session(completed.session_id, "answer", chain)
+        await manager.fail_session(failed.session_id, "boom")
+        await manager.cancel_session(cancelled.session_id)
+
+        # No flush() in between: the final states are already stored
+        assert stored(manager) == {
+            completed.session_id: "completed",
+            failed.session_id: "failed",
+            cancelled.session_id: "cancelled",
+        }
+        await manager.close()
+
+    run(body)
+
+
+def test_delete_session_during_pending_flush(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path)
+        session = await manager.create_session({})
+        await manager.update_session_progress(session.session_id, progress(10.0))
+
+        # The flush takes the pending row and writes it in a worker thread
+        # while the delete is issued
+        flush = asyncio.create_task(manager.flush())
+        await asyncio.sleep(0)
+        assert await manager.delete_session(session.session_id)
+        await flush
+
+        assert stored(manager) == {}
+        assert await manager.get_session(session.session_id) is None
+        await manager.close()
+
+    run(body)
+
+
+def test_delete_session_drops_unwritten_update(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path)
+        session = await manager.create_session({})
+        await manager.flush()
+        await manager.update_session_progress(session.session_id, progress(10.0))
+
+        assert await manager.delete_session(session.session_id)
+        await manager.flush()
+
+        assert stored(manager) == {}
+        await manager.close()
+
+    run(body)
+
+
+def test_close_flushes_pending_sessions(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path)
+        sessions = [await manager.create_session({"n": n}) for n in range(3)]
+        await manager.close()
+
+        reopened = make_manager(tmp_path)
+        loaded = [await reopened.get_session(s.session_id) for s in sessions]
+        await reopened.close()
+        return loaded
+
+    loaded = run(body)
+    assert [session.metadata.extras for session in loaded] == [
+        {"n": 0},
+        {"n": 1},
+        {"n": 2},
+    ]
+
+
+def test_active_count_follows_lru_eviction(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path, max_active_sessions=2)
+        first = await manager.create_session({})
+        second = await manager.create_session({})
+        third = await manager.create_session({})
+
+        # The least recently used session was evicted and stopped counting
+        assert first.session_id not in manager._active_sessions
+        assert len(manager._active_sessions) == 2
+        assert manager.get_session_metrics()["active_count"] == 2
+
+        await manager.cancel_session(second.session_id)
+        await manager.cancel_session(second.session_id)
+        assert manager.get_session_metrics()["active_count"] == 1
+
+        # Reloading the evicted session counts it again; the cancel touched
+        # the second session last, so the third is evicted in its place
+        assert await manager.get_session(first.session_id) is not None
+        assert list(manager._active_sessions) == [
+            second.session_id,
+            first.session_id,
+        ]
+        assert third.session_id not in manager._active_sessions
+        assert manager.get_session_metrics()["active_count"] == 1
+
+        await manager.delete_session(first.session_id)
+        assert manager.get_session_metrics()["active_count"] == 0
+        await manager.close()
+
+    run(body)
+
+
+def test_processing_sessions_are_not_evicted(tmp_path):
+    async def body():
+        manager = make_manager(tmp_path, max_active_sessions=1)
+        busy = await manager.create_session({})
+        busy.start_processing("q")
+        await manager.create_session({})
+
+        assert busy.session_id in manager._active_sessions
+        assert busy.status == SessionStatus.PROCESSING
+        assert manager.get_session_metrics()["active_count"] == 1
+        await manager.close()
+
+    run(body)
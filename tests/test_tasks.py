@@ -0,0 +1,143 @@
+import pytest
+
+from agent.tasks import Task, TaskList, TaskPriority, TaskStatus
+
+
+def make_task(task_id, priority=TaskPriority.MEDIUM, dependencies=()):
+    return Task(
+        id=task_id,
+        title=task_id,
+        description=f"task {task_id}",
+        priority=priority,
+        dependencies=dependencies,
+    )
+
+
+def make_list(*tasks):
+    task_list = TaskList(name="test")
+    task_list.bulk_add_tasks(tasks)
+    return task_list
+
+
+def ready_ids(task_list):
+    return [task.id for task in task_list.get_ready_tasks()]
+
+
+def complete(task_list, task_id):
+    task_list.get_task(task_id).complete_execution("done")
+    task_list.mark_task_completed(task_id)
+
+
+def test_ready_tasks_ordered_by_priority():
+    task_list = make_list(
+        make_task("low", TaskPriority.LOW),
+        make_task("critical", TaskPriority.CRITICAL),
+        make_task("medium"),
+        make_task("high", TaskPriority.HIGH),
+    )
+
+    assert ready_ids(task_list) == ["critical", "high", "medium", "low"]
+    # Looking does not consume the queue
+    assert ready_ids(task_list) == ["critical", "high", "medium", "low"]
+    assert task_list.pop_next_ready().id == "critical"
+    assert ready_ids(task_list) == ["high", "medium", "low"]
+
+
+def test_completion_unblocks_dependents():
+    task_list = make_list(
+        make_task("a"),
+        make_task("b"),
+        make_task("c", dependencies=("a", "b")),
+    )
+    assert ready_ids(task_list) == ["a", "b"]
+    assert [task.id for task in task_list.get_blocked_tasks()] == ["c"]
+
+    complete(task_list, "a")
+    assert ready_ids(task_list) == ["b"]
+
+    complete(task_list, "b")
+    assert ready_ids(task_list) == ["c"]
+    assert task_list.get_blocked_tasks() == []
+
+
+def test_reset_task_requeues_it():
+    task_list = make_list(make_task("a"), make_task("b", dependencies=("a",)))
+    task = task_list.pop_next_ready()
+    task.start_execution()
+    task.fail_execution("boom")
+    task_list.mark_task_failed("a")
+    assert ready_ids(task_list) == []
+
+    task_list.reset_task("a")
+    assert task_list.get_task("a").status == TaskStatus.PENDING
+    assert task_list.failed_task_ids == []
+    assert ready_ids(task_list) == ["a"]
+
+
+def test_reset_of_completed_task_blocks_dependents_again():
+    task_list = make_list(make_task("a"), make_task("b", dependencies=("a",)))
+    complete(task_list, "a")
+    assert ready_ids(task_list) == ["b"]
+
+    task_list.reset_task("a")
+    assert ready_ids(task_list) == ["a"]
+    assert not task_list.is_task_completed("a")
+    assert [task.id for task in task_list.get_blocked_tasks()] == ["b"]
+
+
+def test_cycle_leaves_no_schedule():
+    task_list = make_list(
+        make_task("a", dependencies=("c",)),
+        make_task("b", dependencies=("a",)),
+        make_task("c", dependencies=("b",)),
+        make_task("d"),
+    )
+
+    with pytest.raises(ValueError, match="cycle"):
+        task_list.compute_schedule()
+    assert task_list.schedule_levels() == []
+    assert [task.id for task in task_list.scheduled_tasks()] == ["a", "b", "c", "d"]
+
+
+def test_compute_schedule_levels():
+    task_list = make_list(
+        make_task("c", dependencies=("a", "b")),
+        make_task("a"),
+        make_task("b", dependencies=("a",)),
+    )
+
+    assert task_list.compute_schedule() == [["a"], ["b"], ["c"]]
+    assert task_list.execution_order == ["a", "b", "c"]
+
+
+def test_duplicate_task_id_rejected():
+    task_list = make_list(make_task("a"))
+
+    with pytest.raises(ValueError, match="Duplicate task id"):
+        task_list.add_task(make_task("a"))
+    with pytest.raises(ValueError, match="Duplicate task id"):
+        task_list.bulk_add_tasks([make_task("b"), make_task("b")])
+    # A rejected batch adds nothing
+    assert [task.id for task in task_list.tasks] == ["a"]
+    assert task_list.execution_order == ["a"]
+
+
+def test_json_round_trip_rebuilds_indexes():
+    task_list = make_list(
+        make_task("a"),
+        make_task("b", TaskPriority.HIGH, dependencies=("a",)),
+        make_task("c", TaskPriority.LOW, dependencies=("a",)),
+        make_task("d"),
+    )
+    complete(task_list, "a")
+
+    restored = TaskList.model_validate_json(task_list.model_dump_json())
+
+    assert restored.get_task("b").dependencies == ("a",)
+    assert restored.is_task_completed("a")
+    assert ready_ids(restored) == ["b", "d", "c"]
+    complete(restored, "d")
+    assert ready_ids(restored) == ["b", "c"]
+    assert restored.get_progress_percentage() == 50.0
+    with pytest.raises(ValueError, match="Duplicate task id"):
+        restored.add_task(make_task("a"))